@@ -0,0 +1,52 @@
+# Measures ParticleSystem update and draw cost with many live particles.
+# Usage: python benchmarks/bench_particles.py [particles] [frames]
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import bird
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    screen = pygame.display.set_mode((bird.SCREEN_WIDTH, bird.SCREEN_HEIGHT))
+    particles = bird.ParticleSystem()
+    rng = random.Random(0)
+
+    def top_up():
+        # Keep the population near the target, like continuous combo bursts
+        while len(particles) < target:
+            particles.spawn(rng.uniform(0, bird.SCREEN_WIDTH), rng.uniform(0, bird.SCREEN_HEIGHT),
+                            rng.choice(bird.PARTICLE_COLORS), rng.uniform(-4, 4), rng.uniform(-5, -1),
+                            rng.randint(40, 70), rng.choice(bird.PARTICLE_TYPES))
+
+    top_up()
+    update_time = draw_time = 0.0
+    for _ in range(frames):
+        top_up()
+        start = time.perf_counter()
+        particles.update()
+        middle = time.perf_counter()
+        particles.draw(screen)
+        end = time.perf_counter()
+        update_time += middle - start
+        draw_time += end - middle
+
+    print(f"live particles: ~{target}")
+    print(f"update:         {update_time / frames * 1000:.3f} ms/frame")
+    print(f"draw:           {draw_time / frames * 1000:.3f} ms/frame")
+    print(f"frame budget:   {1000 / bird.FPS:.3f} ms")
+    stats = particles.stats()
+    print(f"high water:     {stats['high_water']} of {stats['capacity']} slots, {stats['evicted']} evicted")
+    print(f"gc collections: {stats['gc_collections']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Compares copying the whole screen with PixelObserver's zero-copy sampling
+# and its low-resolution render target.
+# Usage: python benchmarks/bench_pixels.py [frames]
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import bird
+from pixels import PixelObserver
+
+
+def run(game, observe, frames, draw=True):
+    # Step the game with a flap every 20 ticks and observe each frame
+    game.reset_game()
+    game.flap()
+    start = time.perf_counter()
+    for _ in range(frames):
+        if game.step(game.ticks % 20 == 0):
+            game.reset_game()
+            game.flap()
+        if draw:
+            game.draw()
+        observe()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    game = bird.Game(seed=1)
+
+    full_copy = run(game, lambda: pygame.surfarray.array3d(game.screen), frames)
+    observer = PixelObserver(game)
+    zero_copy = run(game, observer.capture, frames)
+    low_res = PixelObserver(game, low_res=True)
+    low_res_time = run(game, low_res.capture, frames, draw=False)
+
+    print(f"frames:               {frames}")
+    print(f"draw + array3d copy:  {full_copy:.3f} ms/frame")
+    print(f"draw + pixel view:    {zero_copy:.3f} ms/frame")
+    print(f"low-res target only:  {low_res_time:.3f} ms/frame")
+    print(f"stacked shape:        {observer.stacked().shape}")
+
+
+if __name__ == "__main__":
+    main()
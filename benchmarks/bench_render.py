@@ -0,0 +1,299 @@
+# Headless rendering benchmark suite with regression thresholds.
+#
+# Runs Game.update and Game.draw under SDL's dummy video driver with fixed
+# seeds and a pinned animation clock for a set of scenarios, reports
+# frame-time percentiles and per-frame allocation counts, and exits non-zero
+# when a scenario regresses past the stored baseline. Allocations are counted
+# two ways: Python memory blocks a frame leaves live (tracemalloc), and
+# pygame surfaces a frame creates, whose pixel buffers tracemalloc can't see.
+#
+# Usage: python benchmarks/bench_render.py [--frames N] [--only NAME ...]
+#                                          [--update-baseline] [--tolerance 0.25]
+#
+# Baselines are machine specific: regenerate them with --update-baseline
+# on the machine that runs the comparison.
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+import bird
+import simulation
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_baseline.json")
+WARMUP_FRAMES = 30
+ALLOC_FRAMES = 120
+BLOCK_SLACK = 16      # Absolute slack so tiny allocation baselines don't flap
+SURFACE_SLACK = 0.05  # A surface every 20 frames; a per-frame one always fails
+FRAME_SLACK_MS = 0.5  # Absolute slack for timer and scheduler noise
+REPEATS = 3           # Each scenario runs this often; the fastest run counts
+
+
+def time_for_cycle(time_cycle, rising=True):
+    # Animation clock (ms) at which Game.draw's sky reaches `time_cycle`
+    base = math.asin(time_cycle * 2 - 1)
+    offset = base if rising else math.pi - base
+    return (offset % (2 * math.pi)) / 0.00005
+
+
+DAY = time_for_cycle(0.25)
+NIGHT = time_for_cycle(0.95)
+
+
+def hover(game):
+    # Keep the bird alive in an empty sky
+    game.pipes.clear()
+    game.next_pipe = 0
+    game.bird.y = bird.SCREEN_HEIGHT // 2
+    game.bird.velocity = 0
+
+
+def thread_gaps(game):
+    # Keep the bird inside the gap of the pipe it is passing
+    for pipe in game.pipes:
+        if pipe.x + bird.PIPE_WIDTH > game.bird.x - bird.BIRD_SIZE:
+            game.bird.y = pipe.height + pipe.gap_size / 2
+            break
+    game.bird.velocity = 0
+
+
+def setup_empty_sky(game):
+    game.flap()
+
+
+def setup_max_pipes(game):
+    # Hardest difficulty: fastest pipes at the tightest spacing
+    game.flap()
+    game.score = 40
+    game.current_speed = game.get_current_speed()
+    spacing = max(simulation.MIN_PIPE_SPACING,
+                  int(simulation.PIPE_SPACING_BASE - game.current_speed * simulation.PIPE_SPACING_SLOPE))
+    for x in range(bird.SCREEN_WIDTH, -bird.PIPE_WIDTH, -spacing):
+        pipe = game.spawn_pipe()
+        pipe.x = x
+    game.pipes = deque(sorted(game.pipes, key=lambda pipe: pipe.x))
+
+
+def setup_combo_storm(game):
+    game.flap()
+    game.combo_count = 3
+
+
+def storm(game):
+    hover(game)
+    # A scored pipe every few frames keeps the combo at 3x and above
+    if game.ticks % 8 == 0:
+        game.last_score_time = game.sim_time
+        game.add_score_particles()
+
+
+def setup_game_over(game):
+    setup_max_pipes(game)
+    game.score = 20
+    game.game_over = True
+    game.add_collision_particles()
+
+
+SCENARIOS = {
+    # name: (animation clock start, setup, per-frame hook)
+    "empty_sky": (DAY, setup_empty_sky, hover),
+    "max_pipes": (DAY, setup_max_pipes, thread_gaps),
+    "night_sky": (NIGHT, setup_empty_sky, hover),
+    "combo_storm": (DAY, setup_combo_storm, storm),
+    "game_over": (NIGHT, setup_game_over, None),
+}
+
+
+def run_frame(game, clock, frame_hook):
+    bird.set_animation_time(int(clock))
+    if frame_hook is not None:
+        frame_hook(game)
+    start = time.perf_counter()
+    game.update()
+    middle = time.perf_counter()
+    game.draw()
+    end = time.perf_counter()
+    return (middle - start) * 1000, (end - middle) * 1000
+
+
+class SurfaceCounter:
+    # Counts surfaces created through pygame.Surface and pygame.transform
+    # while active
+    TRANSFORMS = ("flip", "rotate", "rotozoom", "scale", "scale2x", "smoothscale")
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        counter = self
+        self.surface_class = pygame.Surface
+        self.transforms = {name: getattr(pygame.transform, name) for name in self.TRANSFORMS}
+
+        class CountedSurface(self.surface_class):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        def counted(transform):
+            def wrapper(*args, **kwargs):
+                counter.count += 1
+                return transform(*args, **kwargs)
+            return wrapper
+
+        pygame.Surface = CountedSurface
+        for name, transform in self.transforms.items():
+            setattr(pygame.transform, name, counted(transform))
+        return self
+
+    def __exit__(self, *exc_info):
+        pygame.Surface = self.surface_class
+        for name, transform in self.transforms.items():
+            setattr(pygame.transform, name, transform)
+
+
+def new_blocks(before, after):
+    # Memory blocks allocated between two tracemalloc snapshots and still live
+    return sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno"))
+
+
+def run_scenario(name, frames, repeats=REPEATS):
+    # Keep the best of several runs, other processes only ever add time
+    runs = [run_once(name, frames) for _ in range(repeats)]
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def warmed_up(name):
+    # A scenario's game after its warm-up frames, and the clock it reached
+    clock, setup, frame_hook = SCENARIOS[name]
+    game = bird.Game(seed=1234)
+    setup(game)
+    for _ in range(WARMUP_FRAMES):
+        run_frame(game, clock, frame_hook)
+        clock += 1000 / bird.FPS
+    return game, clock
+
+
+def run_once(name, frames):
+    frame_hook = SCENARIOS[name][2]
+    step = 1000 / bird.FPS
+
+    game, clock = warmed_up(name)
+    update_times = []
+    draw_times = []
+    for _ in range(frames):
+        update_ms, draw_ms = run_frame(game, clock, frame_hook)
+        update_times.append(update_ms)
+        draw_times.append(draw_ms)
+        clock += step
+
+    # Allocations are counted in a separate pass, tracing skews timings. It
+    # starts over, with the caches Games share emptied, so the counts depend
+    # on neither --frames nor the runs before it
+    bird.Pipe.atlas = None
+    bird.Bird.frames = None
+    game, clock = warmed_up(name)
+    tracemalloc.start()
+    blocks = []
+    with SurfaceCounter() as surfaces:
+        before = tracemalloc.take_snapshot()
+        for _ in range(ALLOC_FRAMES):
+            run_frame(game, clock, frame_hook)
+            after = tracemalloc.take_snapshot()
+            blocks.append(new_blocks(before, after))
+            before = after
+            clock += step
+    tracemalloc.stop()
+    bird.set_animation_time(None)
+
+    update_times = np.array(update_times)
+    draw_times = np.array(draw_times)
+    total = update_times + draw_times
+    return {
+        "frame_p50_ms": float(np.percentile(total, 50)),
+        "frame_p95_ms": float(np.percentile(total, 95)),
+        "frame_p99_ms": float(np.percentile(total, 99)),
+        "update_p50_ms": float(np.percentile(update_times, 50)),
+        "draw_p50_ms": float(np.percentile(draw_times, 50)),
+        "blocks_per_frame": float(np.mean(blocks)),
+        "surfaces_per_frame": surfaces.count / ALLOC_FRAMES,
+    }
+
+
+def regressions(name, result, baseline, tolerance):
+    problems = []
+    # Tail latencies are noisier than the median, so they get twice the room
+    for key, room in (("frame_p50_ms", tolerance), ("frame_p95_ms", tolerance * 2)):
+        limit = baseline[key] * (1 + room) + FRAME_SLACK_MS
+        if result[key] > limit:
+            problems.append(f"{name}: {key} {result[key]:.3f} > {limit:.3f} (baseline {baseline[key]:.3f})")
+    # Surface counts are deterministic under the pinned clock, so they get
+    # no proportional room: one extra surface per frame must fail
+    for key, room, slack in (("blocks_per_frame", tolerance, BLOCK_SLACK),
+                             ("surfaces_per_frame", 0, SURFACE_SLACK)):
+        limit = baseline[key] * (1 + room) + slack
+        if result[key] > limit:
+            problems.append(f"{name}: {key} {result[key]:.2f} > {limit:.2f} (baseline {baseline[key]:.2f})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering benchmarks")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="scenarios to run")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown over the baseline before failing (0.25 = 25%%), "
+                             "p95 gets twice as much")
+    args = parser.parse_args()
+
+    pygame.display.set_mode((bird.SCREEN_WIDTH, bird.SCREEN_HEIGHT))
+    names = args.only or list(SCENARIOS)
+    results = {}
+    print(f"{'scenario':<12} {'p50':>8} {'p95':>8} {'p99':>8} {'update':>8} {'draw':>8} {'blocks':>8} {'surfaces':>9}")
+    for name in names:
+        result = results[name] = run_scenario(name, args.frames, args.repeats)
+        print(f"{name:<12} {result['frame_p50_ms']:8.3f} {result['frame_p95_ms']:8.3f} "
+              f"{result['frame_p99_ms']:8.3f} {result['update_p50_ms']:8.3f} "
+              f"{result['draw_p50_ms']:8.3f} {result['blocks_per_frame']:8.1f} "
+              f"{result['surfaces_per_frame']:9.2f}")
+
+    if args.update_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                stored = json.load(file)
+        stored.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(stored, file, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    problems = []
+    for name, result in results.items():
+        if name in baseline:
+            problems += regressions(name, result, baseline[name], args.tolerance)
+    for problem in problems:
+        print("REGRESSION", problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# Measures RolloutPool throughput from one worker up to one per core.
+# Usage: python benchmarks/bench_rollout.py [steps] [envs_per_worker]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rollout import RolloutPool
+from vecenv import reference_actions
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    envs_per_worker = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, 64, cores} & set(range(1, cores + 1)))
+
+    for num_workers in counts:
+        with RolloutPool(num_workers, envs_per_worker) as pool:
+            obs = pool.reset()
+
+            start = time.perf_counter()
+            for _ in range(steps):
+                obs, rewards, dones = pool.step(reference_actions(obs))
+            sync_rate = steps * pool.num_envs / (time.perf_counter() - start)
+
+            # Async mode: re-issue each worker as soon as it finishes
+            workers = list(range(num_workers))
+            pool.step_async(workers, reference_actions(obs))
+            done_steps = 0
+            start = time.perf_counter()
+            while done_steps < steps * num_workers:
+                ready = pool.wait_ready()
+                done_steps += len(ready)
+                actions = np.concatenate([reference_actions(obs[pool.slices[i]]) for i in ready])
+                pool.step_async(ready, actions)
+            pool.wait_all()
+            async_rate = done_steps * envs_per_worker / (time.perf_counter() - start)
+
+        print(f"{num_workers:3d} workers x {envs_per_worker} envs: "
+              f"sync {sync_rate:12,.0f} steps/sec, async {async_rate:12,.0f} steps/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# Measures headless Simulation throughput with a simple scripted policy.
+# Usage: python benchmarks/bench_simulation.py [steps]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import Simulation, reference_agent
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    sim = Simulation()
+    sim.flap()
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        if sim.step(reference_agent(sim)):
+            episodes += 1
+            sim.reset_game()
+            sim.flap()
+    elapsed = time.perf_counter() - start
+    print(f"steps:      {steps}")
+    print(f"episodes:   {episodes}")
+    print(f"steps/sec:  {steps / elapsed:,.0f}")
+    print(f"realtime:   {steps / elapsed / 60:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Compares the per-row sky renderer with the cached SkyRenderer: frame time,
+# and the largest per-channel pixel difference over one full day/night cycle.
+# Usage: python benchmarks/bench_sky.py [frames]
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+import bird
+
+CHECK_INTERVAL_MS = 500  # Animation time between compared frames
+MAX_DIFFERENCE = 8       # Allowed per-channel error from quantizing time_cycle
+
+
+def run(draw, frames):
+    # Advance time_offset the same way Game.draw does at 60 FPS
+    time_offset = 0.0
+    step = 1000 / bird.FPS * 0.00005
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw(time_offset)
+        time_offset += step
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def max_difference(sky, screen):
+    # Largest channel difference between cached and uncached skies, sampled
+    # every CHECK_INTERVAL_MS over one cycle of time_offset (2pi)
+    reference = pygame.Surface(screen.get_size()).convert()
+    worst = 0
+    for clock in np.arange(0, 2 * np.pi / 0.00005, CHECK_INTERVAL_MS):
+        time_offset = clock * 0.00005
+        sky.draw(screen, time_offset)
+        sky.draw_uncached(reference, time_offset)
+        cached = pygame.surfarray.pixels3d(screen).astype(np.int16)
+        uncached = pygame.surfarray.pixels3d(reference).astype(np.int16)
+        worst = max(worst, int(np.abs(cached - uncached).max()))
+    return worst
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    screen = pygame.display.set_mode((bird.SCREEN_WIDTH, bird.SCREEN_HEIGHT))
+    sky = bird.SkyRenderer()
+
+    uncached = run(lambda t: sky.draw_uncached(screen, t), frames)
+    cached = run(lambda t: sky.draw(screen, t), frames)
+
+    print(f"frames:         {frames}")
+    print(f"uncached sky:   {uncached:.3f} ms/frame")
+    print(f"cached sky:     {cached:.3f} ms/frame")
+    print(f"saved:          {uncached - cached:.3f} ms/frame ({uncached / cached:.1f}x)")
+    print(f"cache hit rate: {sky.hits / max(1, sky.hits + sky.misses):.1%}")
+    difference = max_difference(sky, screen)
+    print(f"max difference: {difference}/255 per channel over one cycle (limit {MAX_DIFFERENCE})")
+    return 1 if difference > MAX_DIFFERENCE else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# Measures startup latency of short-lived processes: how long `import bird`
+# takes, and how long a Game then needs to put its first frame on screen.
+# Each run is a fresh interpreter so module caches don't hide the cost.
+# Usage: python benchmarks/bench_startup.py [runs]
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import bird
+imported = time.perf_counter()
+game = bird.Game(seed=0)
+created = time.perf_counter()
+game.update()
+game.present()
+first_frame = time.perf_counter()
+json.dump({
+    "import_ms": (imported - start) * 1000,
+    "game_ms": (created - imported) * 1000,
+    "first_frame_ms": (first_frame - created) * 1000,
+    "total_ms": (first_frame - start) * 1000,
+}, sys.stdout)
+"""
+
+
+def probe():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    results = [probe() for _ in range(runs)]
+    print(f"runs: {runs}")
+    for key in ("import_ms", "game_ms", "first_frame_ms", "total_ms"):
+        values = np.array([result[key] for result in results])
+        print(f"{key:<15} p50 {np.percentile(values, 50):8.2f}   max {values.max():8.2f}")
+
+
+if __name__ == "__main__":
+    main()
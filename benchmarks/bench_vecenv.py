@@ -0,0 +1,30 @@
+# Measures VecEnv throughput for a range of batch sizes.
+# Usage: python benchmarks/bench_vecenv.py [steps]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vecenv import VecEnv, reference_actions
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for num_envs in (1, 64, 512, 4096):
+        env = VecEnv(num_envs, seed=0)
+        obs = env.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(steps):
+            obs, rewards, dones = env.step(reference_actions(obs))
+            episodes += int(np.count_nonzero(dones))
+        elapsed = time.perf_counter() - start
+        print(f"{num_envs:5d} envs: {steps * num_envs / elapsed:12,.0f} env-steps/sec, "
+              f"{steps / elapsed:8,.0f} batch steps/sec, {episodes} episodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,28 +2,66 @@ import pygame
 import random
 import sys
 import math
+import time
+import argparse
+import gc
+import numpy as np
+from collections import OrderedDict
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-
-# Constants
-SCREEN_WIDTH = 1000
-SCREEN_HEIGHT = 600
-BIRD_SIZE = 30
-PIPE_WIDTH = 60
-INITIAL_PIPE_GAP = 250  # Start with larger gap
-MIN_PIPE_GAP = 150      # Minimum gap size
-INITIAL_PIPE_SPEED = 1.5  # Start slower
-MAX_PIPE_SPEED = 4.5      # Maximum speed
-GRAVITY = 0.45
-JUMP_STRENGTH = -8
-PIPE_SPAWN_RATE = 5000  # milliseconds
-FPS = 60
-
-# Speed and gap progression settings
-SPEED_INCREASE_RATE = 0.08  # How much speed increases per score point
-GAP_DECREASE_RATE = 4       # How much gap decreases per score point
+from simulation import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BIRD_SIZE, PIPE_WIDTH, INITIAL_PIPE_GAP, MIN_PIPE_GAP,
+    INITIAL_PIPE_SPEED, MAX_PIPE_SPEED, GRAVITY, JUMP_STRENGTH, PIPE_SPAWN_RATE, FPS,
+    SPEED_INCREASE_RATE, GAP_DECREASE_RATE, BirdBody, PipeBody, Simulation,
+)
+from replay import Replay, ReplayWriter
+from profiler import FrameProfiler, NullProfiler
+
+# Render caches
+SKY_CACHE_LEVELS = 128  # Quantized time_cycle steps per half of the day cycle
+SKY_CACHE_SIZE = 4      # Pre-rendered sky surfaces kept in memory
+PIPE_ATLAS_SIZE = 48    # Pre-rendered pipe sprites kept in memory
+BIRD_ANGLE_STEP = 2     # Degrees between pre-rotated bird frames
+BIRD_WING_PHASES = 16   # Wing positions per idle wing-beat cycle
+PARTICLE_CAPACITY = 1024  # Initial particle slots, doubled when full
+PARTICLE_LIMIT = 16384    # Live particle cap, the oldest are evicted beyond it
+
+# Main loop timing
+MAX_FRAME_TIME = 0.25         # Seconds of lag the fixed-timestep loop catches up on
+TURBO_INPUT_INTERVAL = 1000   # Steps between event polls when turbo mode isn't rendering
+PROFILER_EXPORT_PATH = "frame_profile.csv"
+
+# Bird trail
+TRAIL_LENGTH = 14   # Past positions kept and drawn behind the bird
+TRAIL_SPACING = 2   # Pixels the trail shifts left per frame of age
+TRAIL_FADE = 255 // (TRAIL_LENGTH + 3)  # Alpha lost per frame of age
+
+# Adaptive quality, levels from full detail down to minimal effects:
+# (sky gradient steps, pipe glow, trail length, particle share, star share)
+QUALITY_LEVELS = (
+    (SKY_CACHE_LEVELS, True, TRAIL_LENGTH, 1.0, 1.0),
+    (64, True, 10, 0.75, 0.6),
+    (32, False, 6, 0.5, 0.3),
+    (16, False, 0, 0.25, 0.0),
+)
+QUALITY_SMOOTHING = 0.1      # Weight of the newest frame in the frame time average
+QUALITY_DOWN_RATIO = 1.0     # Step down while the average exceeds this share of the budget
+QUALITY_UP_RATIO = 0.5       # Step up while the average stays below this share
+QUALITY_DOWN_FRAMES = 30     # Frames over budget before stepping down
+QUALITY_UP_FRAMES = 180      # Frames with headroom before stepping back up
+
+# Star field
+STAR_COUNT = 50               # Stars in the night sky
+STAR_BRIGHTNESS_BUCKETS = 16  # Alpha steps of pre-baked star sprites
+
+# Dirty-rectangle rendering
+LAYER_REFRESH_FRAMES = 6  # Frames between rebuilds of the cached background layer
+
+# Population mode
+POPULATION_ALPHA = 60   # Opacity of each bird when a whole population is drawn
+
+# Text rendering
+TEXT_CACHE_SIZE = 256   # Rendered text surfaces kept in memory
+TEXT_PULSE_STEPS = 32   # Brightness steps of pulsing instruction text
 
 # Enhanced Colors with more variety
 WHITE = (255, 255, 255)
@@ -63,172 +101,358 @@ DAY_COLORS = [(135, 206, 235), (176, 224, 230)]
 SUNSET_COLORS = [(255, 94, 77), (255, 154, 0)]
 NIGHT_COLORS = [(25, 25, 112), (72, 61, 139)]
 
-class Particle:
-    def __init__(self, x, y, color, velocity_x, velocity_y, life, particle_type="circle"):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
-        self.life = life
-        self.max_life = life
-        self.particle_type = particle_type
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-5, 5)
-        
+# Clock for visual animation (sky cycle, glow, twinkle) in milliseconds since
+# init(); pinned by benchmarks through set_animation_time so frames are
+# repeatable
+pinned_animation_time = None
+animation_epoch = time.perf_counter()
+
+def animation_time():
+    if pinned_animation_time is not None:
+        return pinned_animation_time
+    return int((time.perf_counter() - animation_epoch) * 1000)
+
+def set_animation_time(ms=None):
+    global pinned_animation_time
+    pinned_animation_time = ms
+
+def init(audio=False):
+    # Bring up only the pygame modules the game draws with; importing this
+    # module initializes nothing, so headless tools never touch display or
+    # audio devices. Safe to call repeatedly
+    global animation_epoch
+    if not pygame.display.get_init():
+        pygame.display.init()
+        animation_epoch = time.perf_counter()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if audio and not pygame.mixer.get_init():
+        pygame.mixer.init()
+
+PARTICLE_TYPES = ("circle", "star", "sparkle")
+PARTICLE_VARIANTS = 16  # Alpha buckets for circles, rotation buckets for stars
+PARTICLE_CODES = len(PARTICLE_TYPES) * 256 * 8 * PARTICLE_VARIANTS  # type, color, size, variant
+PARTICLE_MAX_HALF = 10  # Largest sprite half-size, sparkles and stars of size 4
+
+class ParticleSystem:
+    # Structure-of-arrays particle engine. Live particles occupy the first
+    # `count` slots; dead ones are swap-removed so the arrays stay dense, and
+    # the free slots past `count` are reused without allocating objects.
+    # Beyond `limit` live particles, a spawn overwrites the oldest one.
+    def __init__(self, capacity=PARTICLE_CAPACITY, rng=random, limit=PARTICLE_LIMIT):
+        self.count = 0
+        self.rng = rng
+        self.limit = limit
+        self.spawned = 0
+        self.evicted = 0
+        self.high_water = 0
+        self.allocate(min(capacity, limit) if limit else capacity)
+
+        # Sprites are baked per (type, color, size, variant) code on first use
+        self.palette = {}
+        self.colors = []
+        self.sprites = [None] * PARTICLE_CODES
+        self.offsets = np.zeros(PARTICLE_CODES, dtype=np.int32)
+        self.baked = set()
+
+    def allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.velocity_x = np.zeros(capacity, dtype=np.float32)
+        self.velocity_y = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.max_life = np.ones(capacity, dtype=np.int32)
+        self.rotation = np.zeros(capacity, dtype=np.float32)
+        self.rotation_speed = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.born = np.zeros(capacity, dtype=np.int64)  # Spawn sequence number
+
+    def arrays(self):
+        return (self.x, self.y, self.velocity_x, self.velocity_y, self.life, self.max_life,
+                self.rotation, self.rotation_speed, self.kind, self.color, self.born)
+
+    def grow(self):
+        old = self.arrays()
+        capacity = self.capacity * 2
+        self.allocate(min(capacity, self.limit) if self.limit else capacity)
+        for src, dst in zip(old, self.arrays()):
+            dst[:self.count] = src[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, color, velocity_x, velocity_y, life, particle_type="circle"):
+        if self.count == self.limit:
+            # At the cap: reuse the slot of the oldest live particle
+            i = int(np.argmin(self.born[:self.count]))
+            self.evicted += 1
+        else:
+            if self.count == self.capacity:
+                self.grow()
+            i = self.count
+            self.count += 1
+            self.high_water = max(self.high_water, self.count)
+        self.x[i] = x
+        self.y[i] = y
+        self.velocity_x[i] = velocity_x
+        self.velocity_y[i] = velocity_y
+        self.life[i] = life
+        self.max_life[i] = life
+        self.rotation[i] = self.rng.uniform(0, 360)
+        self.rotation_speed[i] = self.rng.uniform(-5, 5)
+        self.kind[i] = PARTICLE_TYPES.index(particle_type)
+        color = tuple(color[:3])
+        if color not in self.palette:
+            self.palette[color] = len(self.colors)
+            self.colors.append(color)
+        self.color[i] = self.palette[color]
+        self.born[i] = self.spawned
+        self.spawned += 1
+
+    def stats(self):
+        # Pool usage plus the interpreter's GC state, to check that bursts
+        # don't drive collections
+        return {
+            "live": self.count,
+            "capacity": self.capacity,
+            "limit": self.limit,
+            "high_water": self.high_water,
+            "spawned": self.spawned,
+            "evicted": self.evicted,
+            "gc_counts": gc.get_count(),
+            "gc_collections": tuple(generation["collections"] for generation in gc.get_stats()),
+        }
+
     def update(self):
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.velocity_y += 0.1  # Gravity on particles
-        self.velocity_x *= 0.99  # Air resistance
-        self.life -= 1
-        self.rotation += self.rotation_speed
-        
-    def draw(self, screen):
-        if self.life <= 0:
+        n = self.count
+        if n == 0:
             return
-            
-        alpha_ratio = self.life / self.max_life
-        alpha = int(255 * alpha_ratio)
-        size = max(1, int(4 * alpha_ratio))
-        
-        if self.particle_type == "star":
-            self.draw_star(screen, size, alpha_ratio)
-        elif self.particle_type == "sparkle":
-            self.draw_sparkle(screen, size, alpha_ratio)
+        self.x[:n] += self.velocity_x[:n]
+        self.y[:n] += self.velocity_y[:n]
+        self.velocity_y[:n] += 0.1  # Gravity on particles
+        self.velocity_x[:n] *= 0.99  # Air resistance
+        self.life[:n] -= 1
+        self.rotation[:n] += self.rotation_speed[:n]
+        self.compact()
+
+    def compact(self):
+        n = self.count
+        alive = self.life[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        # Move live particles from the tail into the holes left by dead ones
+        holes = np.flatnonzero(~alive[:live])
+        fillers = live + np.flatnonzero(alive[live:])
+        for array in self.arrays():
+            array[holes] = array[fillers]
+        self.count = live
+
+    def sprite_keys(self):
+        n = self.count
+        ratio = self.life[:n] / self.max_life[:n]
+        size = np.maximum(1, (4 * ratio).astype(np.int32))
+        variant = np.zeros(n, dtype=np.int32)
+
+        circles = self.kind[:n] == 0
+        variant[circles] = np.minimum(PARTICLE_VARIANTS - 1, (ratio[circles] * PARTICLE_VARIANTS).astype(np.int32))
+        # A five-pointed star looks the same every 72 degrees
+        stars = self.kind[:n] == 1
+        variant[stars] = (self.rotation[:n][stars] % 72 / 72 * PARTICLE_VARIANTS).astype(np.int32) % PARTICLE_VARIANTS
+
+        kind = self.kind[:n].astype(np.int32)
+        color = self.color[:n].astype(np.int32)
+        return ((kind * 256 + color) * 8 + size) * PARTICLE_VARIANTS + variant
+
+    def bake(self, code):
+        variant = code % PARTICLE_VARIANTS
+        size = code // PARTICLE_VARIANTS % 8
+        color = self.colors[code // (PARTICLE_VARIANTS * 8) % 256]
+        kind = PARTICLE_TYPES[code // (PARTICLE_VARIANTS * 8 * 256)]
+
+        if kind == "star":
+            half = size * 2 + 1
+            sprite = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+            rotation = (variant + 0.5) / PARTICLE_VARIANTS * 72
+            points = []
+            for i in range(10):  # 5-pointed star
+                angle = math.radians(i * 36 + rotation)
+                radius = size * (2 if i % 2 == 0 else 1)
+                points.append((half + math.cos(angle) * radius, half + math.sin(angle) * radius))
+            pygame.draw.polygon(sprite, color, points)
+        elif kind == "sparkle":
+            # Cross-shaped sparkle with diagonal lines
+            length = size * 2
+            half = length + 1
+            sprite = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+            pygame.draw.line(sprite, color, (half - length, half), (half + length, half), 2)
+            pygame.draw.line(sprite, color, (half, half - length), (half, half + length), 2)
+            diag_len = length * 0.7
+            pygame.draw.line(sprite, color, (half - diag_len, half - diag_len),
+                             (half + diag_len, half + diag_len), 1)
+            pygame.draw.line(sprite, color, (half - diag_len, half + diag_len),
+                             (half + diag_len, half - diag_len), 1)
         else:
-            # Enhanced circle with glow
-            glow_size = size + 2
-            glow_color = (*self.color[:3], max(0, alpha // 3))
-            
-            # Create surface for glow effect
-            glow_surf = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, glow_color, (glow_size, glow_size), glow_size)
-            screen.blit(glow_surf, (int(self.x - glow_size), int(self.y - glow_size)))
-            
-            # Main particle
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
-    
-    def draw_star(self, screen, size, alpha_ratio):
-        points = []
-        for i in range(10):  # 5-pointed star
-            angle = math.radians(i * 36 + self.rotation)
-            radius = size * (2 if i % 2 == 0 else 1)
-            x = self.x + math.cos(angle) * radius
-            y = self.y + math.sin(angle) * radius
-            points.append((x, y))
-        
-        if len(points) >= 3:
-            pygame.draw.polygon(screen, self.color, points)
-    
-    def draw_sparkle(self, screen, size, alpha_ratio):
-        # Draw cross-shaped sparkle
-        length = size * 2
-        pygame.draw.line(screen, self.color, 
-                        (self.x - length, self.y), (self.x + length, self.y), 2)
-        pygame.draw.line(screen, self.color, 
-                        (self.x, self.y - length), (self.x, self.y + length), 2)
-        
-        # Diagonal lines for more sparkle
-        diag_len = length * 0.7
-        pygame.draw.line(screen, self.color,
-                        (self.x - diag_len, self.y - diag_len), 
-                        (self.x + diag_len, self.y + diag_len), 1)
-        pygame.draw.line(screen, self.color,
-                        (self.x - diag_len, self.y + diag_len), 
-                        (self.x + diag_len, self.y - diag_len), 1)
-
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT // 2)
-        self.brightness = random.uniform(0.3, 1.0)
-        self.twinkle_speed = random.uniform(0.02, 0.05)
-        self.size = random.randint(1, 2)
-        self.color = random.choice(STAR_COLORS)
-        
-    def update(self):
-        self.brightness += math.sin(pygame.time.get_ticks() * self.twinkle_speed) * 0.1
-        self.brightness = max(0.2, min(1.0, self.brightness))
-        
+            # Circle with glow
+            alpha = int(255 * (variant + 0.5) / PARTICLE_VARIANTS)
+            half = size + 2
+            sprite = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, max(0, alpha // 3)), (half, half), half)
+            pygame.draw.circle(sprite, color, (half, half), size)
+
+        self.sprites[code] = sprite
+        self.offsets[code] = half
+        self.baked.add(code)
+        return sprite
+
     def draw(self, screen):
-        alpha = int(255 * self.brightness)
-        color_with_alpha = (*self.color[:3], alpha)
+        # Returns the bounding box of everything drawn, or None
+        n = self.count
+        if n == 0:
+            return None
+        codes = self.sprite_keys()
+        for code in set(np.unique(codes).tolist()).difference(self.baked):
+            self.bake(code)
+
+        offsets = self.offsets[codes]
+        xs = (self.x[:n].astype(np.int32) - offsets).tolist()
+        ys = (self.y[:n].astype(np.int32) - offsets).tolist()
+        screen.blits(zip(map(self.sprites.__getitem__, codes.tolist()), zip(xs, ys)), doreturn=False)
+        
+        left = int(self.x[:n].min()) - PARTICLE_MAX_HALF
+        top = int(self.y[:n].min()) - PARTICLE_MAX_HALF
+        right = int(self.x[:n].max()) + PARTICLE_MAX_HALF
+        bottom = int(self.y[:n].max()) + PARTICLE_MAX_HALF
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+class StarField:
+    # Star state lives in arrays and every star is drawn from a sprite baked
+    # per (size, color, brightness bucket, sparkle), all in one blits() call
+    def __init__(self, count=STAR_COUNT, rng=random):
+        stars = [(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT // 2),
+                  rng.uniform(0.3, 1.0), rng.uniform(0.02, 0.05), rng.randint(1, 2),
+                  STAR_COLORS.index(rng.choice(STAR_COLORS)))
+                 for _ in range(count)]
+        columns = list(zip(*stars)) if stars else [()] * 6
+        self.x = np.array(columns[0], dtype=np.int32)
+        self.y = np.array(columns[1], dtype=np.int32)
+        self.brightness = np.array(columns[2], dtype=np.float64)
+        self.twinkle_speed = np.array(columns[3], dtype=np.float64)
+        self.size = np.array(columns[4], dtype=np.int32)
+        self.color = np.array(columns[5], dtype=np.int32)
+        self.sprites = {}
+
+    def __len__(self):
+        return len(self.x)
+
+    def update(self):
+        self.brightness += np.sin(animation_time() * self.twinkle_speed) * 0.1
+        np.clip(self.brightness, 0.2, 1.0, out=self.brightness)
+
+    def bake(self, key):
+        size, color_index, bucket, sparkle = key
+        color = STAR_COLORS[color_index]
+        alpha = int(255 * (bucket + 1) / STAR_BRIGHTNESS_BUCKETS)
         
         # Create twinkling effect
-        twinkle_surface = pygame.Surface((self.size * 4, self.size * 4), pygame.SRCALPHA)
-        pygame.draw.circle(twinkle_surface, self.color, (self.size * 2, self.size * 2), self.size)
+        twinkle_surface = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
+        pygame.draw.circle(twinkle_surface, color, (size * 2, size * 2), size)
         
         # Add sparkle lines for brighter stars
-        if self.brightness > 0.7:
-            line_length = self.size * 3
-            center = (self.size * 2, self.size * 2)
-            pygame.draw.line(twinkle_surface, self.color,
+        if sparkle:
+            line_length = size * 3
+            center = (size * 2, size * 2)
+            pygame.draw.line(twinkle_surface, color,
                            (center[0] - line_length, center[1]), 
                            (center[0] + line_length, center[1]), 1)
-            pygame.draw.line(twinkle_surface, self.color,
+            pygame.draw.line(twinkle_surface, color,
                            (center[0], center[1] - line_length), 
                            (center[0], center[1] + line_length), 1)
-        
-        screen.blit(twinkle_surface, (self.x - self.size * 2, self.y - self.size * 2))
+        twinkle_surface.set_alpha(alpha)
+        self.sprites[key] = twinkle_surface
+        return twinkle_surface
 
-class Bird:
-    def __init__(self):
-        self.x = 50
-        self.y = SCREEN_HEIGHT // 2
-        self.velocity = 0
-        self.size = BIRD_SIZE
-        self.angle = 0
-        self.animation_frame = 0
-        self.wing_flap = 0
-        
-    def jump(self):
-        self.velocity = JUMP_STRENGTH
-        self.wing_flap = 10
-        
-    def update(self):
-        self.velocity += GRAVITY
-        self.y += self.velocity
-        
-        # Update angle based on velocity for realistic rotation
-        self.angle = min(30, max(-30, self.velocity * 3))
-        
-        # Wing flap animation
-        self.animation_frame += 1
-        if self.wing_flap > 0:
-            self.wing_flap -= 1
-            
-    def draw_trail(self, screen):
-        positions = [(self.x - i * 2, self.y + math.sin(i * 0.5 + pygame.time.get_ticks() * 0.01) * 3) 
-                     for i in range(1, 15)]
-        for i, pos in enumerate(positions):
-            color = RAINBOW_COLORS[i % len(RAINBOW_COLORS)]
-            alpha = 255 - (i * 15)
-            if alpha > 0:
-                trail_surf = pygame.Surface((6, 6), pygame.SRCALPHA)
-                pygame.draw.circle(trail_surf, (*color, alpha), (3, 3), 3)
-                screen.blit(trail_surf, (pos[0] - 3, pos[1] - 3))
+    def draw(self, screen, visibility=1.0, count=None):
+        # Brightness scaled by the time-of-day visibility sets each star's
+        # alpha, and bright stars get sparkle lines. Only the first `count`
+        # stars are drawn when given
+        visible = slice(0, count)
+        size = self.size[visible]
+        brightness = self.brightness[visible] * visibility
+        buckets = np.minimum(STAR_BRIGHTNESS_BUCKETS - 1,
+                             (brightness * STAR_BRIGHTNESS_BUCKETS).astype(np.int32))
+        sparkle = brightness > 0.7
+        keys = zip(size.tolist(), self.color[visible].tolist(), buckets.tolist(), sparkle.tolist())
+        left = (self.x[visible] - size * 2).tolist()
+        top = (self.y[visible] - size * 2).tolist()
 
-    def draw(self, screen):
-        self.draw_trail(screen)  # Add this line at the start of the method
-        # Create rotated bird surface
-        bird_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
+        sprites = self.sprites
+        screen.blits([(sprites.get(key) or self.bake(key), (x, y))
+                      for key, x, y in zip(keys, left, top)], doreturn=False)
+
+class BirdFrameCache:
+    # Pre-rotated bird sprites keyed by quantized angle, wing phase and flap
+    # state, so drawing the bird is a single blit
+    def __init__(self, angle_step=BIRD_ANGLE_STEP, wing_phases=BIRD_WING_PHASES, size=BIRD_SIZE):
+        self.angle_step = angle_step
+        self.wing_phases = wing_phases
+        self.size = size
+        self.frames = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, angle, animation_frame, flapping):
+        angle_index = round(angle / self.angle_step)
+        if flapping:
+            return (angle_index, -1)
+        phase = (animation_frame * 0.3) % (2 * math.pi) / (2 * math.pi)
+        return (angle_index, round(phase * self.wing_phases) % self.wing_phases)
+
+    def get(self, angle, animation_frame, flapping):
+        key = self.key_for(angle, animation_frame, flapping)
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.hits += 1
+            return frame
+        self.misses += 1
+        frame = self.render(*key)
+        self.frames[key] = frame
+        return frame
+
+    def warm(self):
+        # Fill the whole table up front for the clamped -30..30 angle range
+        limit = int(30 // self.angle_step)
+        for angle_index in range(-limit, limit + 1):
+            for wing_index in range(-1, self.wing_phases):
+                key = (angle_index, wing_index)
+                if key not in self.frames:
+                    self.frames[key] = self.render(*key)
+
+    def render(self, angle_index, wing_index):
+        size = self.size
+        bird_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
         
         # Body (main circle with gradient effect)
-        center_x, center_y = self.size, self.size
+        center_x, center_y = size, size
         
         # Shadow
-        pygame.draw.circle(bird_surface, SHADOW, (center_x + 2, center_y + 2), self.size // 2)
+        pygame.draw.circle(bird_surface, SHADOW, (center_x + 2, center_y + 2), size // 2)
         
         # Main body with gradient effect
-        for i in range(self.size // 2, 0, -1):
-            brightness = 1 - (i / (self.size // 2)) * 0.3
+        for i in range(size // 2, 0, -1):
+            brightness = 1 - (i / (size // 2)) * 0.3
             body_color = (int(YELLOW[0] * brightness), int(YELLOW[1] * brightness), int(YELLOW[2] * brightness))
             pygame.draw.circle(bird_surface, body_color, (center_x, center_y), i)
         
         # Wing animation
-        wing_offset = math.sin(self.animation_frame * 0.3) * 3 if self.wing_flap == 0 else -5
-        wing_color = ORANGE if self.wing_flap > 0 else (255, 140, 0)
+        flapping = wing_index < 0
+        wing_offset = -5 if flapping else math.sin(wing_index / self.wing_phases * 2 * math.pi) * 3
+        wing_color = ORANGE if flapping else (255, 140, 0)
         
         # Wing
         wing_points = [
@@ -247,105 +471,190 @@ class Bird:
         
         # Beak with gradient
         beak_points = [
-            (center_x + self.size // 2 - 3, center_y),
-            (center_x + self.size // 2 + 8, center_y - 2),
-            (center_x + self.size // 2 + 8, center_y + 2)
+            (center_x + size // 2 - 3, center_y),
+            (center_x + size // 2 + 8, center_y - 2),
+            (center_x + size // 2 + 8, center_y + 2)
         ]
         pygame.draw.polygon(bird_surface, ORANGE, beak_points)
         pygame.draw.polygon(bird_surface, RED, beak_points, 1)
         
         # Rotate the bird based on velocity
-        rotated_bird = pygame.transform.rotate(bird_surface, -self.angle)
-        bird_rect = rotated_bird.get_rect(center=(int(self.x), int(self.y)))
-        screen.blit(rotated_bird, bird_rect)
+        return pygame.transform.rotate(bird_surface, -angle_index * self.angle_step)
+
+    def memory_bytes(self):
+        return sum(frame.get_bytesize() * frame.get_width() * frame.get_height()
+                   for frame in self.frames.values())
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+def bake_trail_sprites():
+    # One 6x6 dot per rainbow color and fade step, [color][age]
+    sprites = []
+    for color in RAINBOW_COLORS:
+        row = []
+        for i in range(TRAIL_LENGTH):
+            trail_surf = pygame.Surface((6, 6), pygame.SRCALPHA)
+            pygame.draw.circle(trail_surf, (*color, max(0, 255 - i * TRAIL_FADE)), (3, 3), 3)
+            row.append(trail_surf)
+        sprites.append(row)
+    return sprites
+
+class Bird(BirdBody):
+    frames = None  # Shared BirdFrameCache, created by Game
+    trail_sprites = None  # Shared bake_trail_sprites() table, created by Game
+
+    def __init__(self):
+        super().__init__()
+        # Ring buffer of the bird's last heights, newest at trail_head
+        self.trail = [self.y] * (TRAIL_LENGTH + 1)
+        self.trail_head = 0
+
+    def update(self):
+        super().update()
+        self.trail_head = (self.trail_head + 1) % len(self.trail)
+        self.trail[self.trail_head] = self.y
+
+    def draw_trail(self, screen, length=TRAIL_LENGTH):
+        # Where the bird was over the last `length` frames, shifted left as if
+        # the world kept scrolling, in one blits() call
+        if length == 0:
+            return None
+        trail = self.trail
+        size = len(trail)
+        head = self.trail_head
+        x = self.x - 3
+        sprites = self.trail_sprites
+        colors = len(RAINBOW_COLORS)
+        rects = screen.blits([(sprites[i % colors][i],
+                               (x - (i + 1) * TRAIL_SPACING, trail[(head - i - 1) % size] - 3))
+                              for i in range(length)])
+        return rects[0].unionall(rects[1:])
+
+    def draw(self, screen, trail_length=TRAIL_LENGTH):
+        trail_rect = self.draw_trail(screen, trail_length)
+        frame = self.frames.get(self.angle, self.animation_frame, self.wing_flap > 0)
+        bird_rect = frame.get_rect(center=(int(self.x), int(self.y)))
+        bird_rect = screen.blit(frame, bird_rect)
+        return bird_rect if trail_rect is None else bird_rect.union(trail_rect)
         
     def get_rect(self):
         return pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, 
                           self.size, self.size)
 
-class Pipe:
-    def __init__(self, x, gap_size, speed):
-        self.x = x
-        self.gap_size = gap_size
-        self.speed = speed
-        self.height = random.randint(100, SCREEN_HEIGHT - gap_size - 100)
-        self.passed = False
-        
-    def update(self):
-        self.x -= self.speed
-        
-    def draw(self, screen):
-        # Add pulsing glow effect
-        time_pulse = math.sin(pygame.time.get_ticks() * 0.003) * 0.2 + 0.8
-        glow_color = (int(NEON_GREEN[0] * time_pulse),
-                     int(NEON_GREEN[1] * time_pulse),
-                     int(NEON_GREEN[2] * time_pulse))
-        
-        # Draw glow
-        glow_surface = pygame.Surface((PIPE_WIDTH + 10, SCREEN_HEIGHT), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*glow_color, 100), 
-                        (0, 0, PIPE_WIDTH + 10, self.height), 5)
-        pygame.draw.rect(glow_surface, (*glow_color, 100),
-                        (0, self.height + self.gap_size, PIPE_WIDTH + 10, 
-                         SCREEN_HEIGHT - self.height - self.gap_size), 5)
-        screen.blit(glow_surface, (self.x - 5, 0))
-        
+class PipeSpriteAtlas:
+    # A pipe's body and caps depend only on (height, gap_size), so each pair is
+    # rendered once and shared. Gaps shrink with the score and heights are
+    # random, so the atlas is an LRU cache with a fixed number of entries.
+    def __init__(self, max_sprites=PIPE_ATLAS_SIZE):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # Shared glow pieces, re-tinted at most once per frame
+        self.glow_color = None
+        self.glow_h = pygame.Surface((PIPE_WIDTH + 10, 5), pygame.SRCALPHA)
+        self.glow_v = pygame.Surface((5, SCREEN_HEIGHT), pygame.SRCALPHA)
+
+    def get(self, height, gap_size):
+        key = (height, gap_size)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self.render(height, gap_size)
+        self.sprites[key] = sprite
+        while len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def render(self, height, gap_size):
+        sprite = pygame.Surface((PIPE_WIDTH + 10, SCREEN_HEIGHT), pygame.SRCALPHA)
+        bottom = height + gap_size
+
+        # Pipe caps with 3D effect, drawn first so the body covers their middle
+        cap_height = 30
+        cap_width = PIPE_WIDTH + 10
+        for cap_top in (height - cap_height, bottom):
+            cap_rect = pygame.Rect(0, cap_top, cap_width, cap_height)
+            pygame.draw.rect(sprite, GREEN, cap_rect)
+            pygame.draw.rect(sprite, DARK_GREEN, cap_rect, 2)
+            # 3D highlight
+            pygame.draw.line(sprite, (100, 200, 100), (cap_rect.left + 2, cap_rect.top + 2), (cap_rect.right - 2, cap_rect.top + 2), 2)
+
         # Pipe gradient and 3D effect
-        pipe_surface = pygame.Surface((PIPE_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        
-        # Top pipe
+        body = pygame.Surface((PIPE_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         for i in range(PIPE_WIDTH):
             brightness = 1 - (i / PIPE_WIDTH) * 0.3
             pipe_color = (int(GREEN[0] * brightness), int(GREEN[1] * brightness), int(GREEN[2] * brightness))
-            pygame.draw.line(pipe_surface, pipe_color, (i, 0), (i, self.height))
-            pygame.draw.line(pipe_surface, pipe_color, (i, self.height + self.gap_size), (i, SCREEN_HEIGHT))
-        
+            pygame.draw.line(body, pipe_color, (i, 0), (i, height))
+            pygame.draw.line(body, pipe_color, (i, bottom), (i, SCREEN_HEIGHT))
+
         # Pipe borders
-        pygame.draw.rect(pipe_surface, DARK_GREEN, (0, 0, PIPE_WIDTH, self.height), 2)
-        pygame.draw.rect(pipe_surface, DARK_GREEN, (0, self.height + self.gap_size, PIPE_WIDTH, SCREEN_HEIGHT - self.height - self.gap_size), 2)
-        
-        # Pipe caps with 3D effect
-        cap_height = 30
-        cap_width = PIPE_WIDTH + 10
-        
-        # Top cap
-        cap_rect = pygame.Rect(self.x - 5, self.height - cap_height, cap_width, cap_height)
-        pygame.draw.rect(screen, GREEN, cap_rect)
-        pygame.draw.rect(screen, DARK_GREEN, cap_rect, 2)
-        # 3D highlight
-        pygame.draw.line(screen, (100, 200, 100), (cap_rect.left + 2, cap_rect.top + 2), (cap_rect.right - 2, cap_rect.top + 2), 2)
-        
-        # Bottom cap
-        cap_rect = pygame.Rect(self.x - 5, self.height + self.gap_size, cap_width, cap_height)
-        pygame.draw.rect(screen, GREEN, cap_rect)
-        pygame.draw.rect(screen, DARK_GREEN, cap_rect, 2)
-        pygame.draw.line(screen, (100, 200, 100), (cap_rect.left + 2, cap_rect.top + 2), (cap_rect.right - 2, cap_rect.top + 2), 2)
-        
-        # Blit the pipe surface
-        screen.blit(pipe_surface, (self.x, 0))
-        
-    def collides_with(self, bird):
-        bird_rect = bird.get_rect()
-        top_pipe = pygame.Rect(self.x, 0, PIPE_WIDTH, self.height)
-        bottom_pipe = pygame.Rect(self.x, self.height + self.gap_size, 
-                                 PIPE_WIDTH, SCREEN_HEIGHT - self.height - self.gap_size)
-        return bird_rect.colliderect(top_pipe) or bird_rect.colliderect(bottom_pipe)
+        pygame.draw.rect(body, DARK_GREEN, (0, 0, PIPE_WIDTH, height), 2)
+        pygame.draw.rect(body, DARK_GREEN, (0, bottom, PIPE_WIDTH, SCREEN_HEIGHT - bottom), 2)
+
+        sprite.blit(body, (5, 0))
+        return sprite
+
+    def draw_glow(self, screen, pipe, glow_color):
+        if glow_color != self.glow_color:
+            self.glow_color = glow_color
+            self.glow_h.fill((*glow_color, 100))
+            self.glow_v.fill((*glow_color, 100))
+
+        # 5px outlines around both pipe halves, built from the shared pieces
+        left = pipe.x - 5
+        right = pipe.x + PIPE_WIDTH
+        for top, bottom in ((0, pipe.height), (pipe.height + pipe.gap_size, SCREEN_HEIGHT)):
+            screen.blit(self.glow_h, (left, top))
+            screen.blit(self.glow_h, (left, bottom - 5))
+            side = (0, 0, 5, bottom - top - 10)
+            screen.blit(self.glow_v, (left, top + 5), side)
+            screen.blit(self.glow_v, (right, top + 5), side)
+
+class Pipe(PipeBody):
+    atlas = None  # Shared PipeSpriteAtlas, created by Game
+
+    def __init__(self, x, gap_size, speed, rng=random):
+        super().__init__(x, gap_size, speed, rng)
+        self.sprite = None
         
-    def is_off_screen(self):
-        return self.x + PIPE_WIDTH < 0
+    def draw(self, screen, glow=True):
+        # Add pulsing glow effect
+        if glow:
+            time_pulse = math.sin(animation_time() * 0.003) * 0.2 + 0.8
+            glow_color = (int(NEON_GREEN[0] * time_pulse),
+                         int(NEON_GREEN[1] * time_pulse),
+                         int(NEON_GREEN[2] * time_pulse))
+            self.atlas.draw_glow(screen, self, glow_color)
+
+        # Body and caps are pre-rendered per gap geometry
+        if self.sprite is None:
+            self.prerender()
+        return screen.blit(self.sprite, (self.x - 5, 0))
+
+    def prerender(self):
+        self.sprite = self.atlas.get(self.height, self.gap_size)
 
 class Cloud:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=random):
         self.x = x
         self.y = y
-        self.speed = random.uniform(0.2, 0.8)
-        self.size = random.randint(20, 40)
+        self.rng = rng
+        self.speed = rng.uniform(0.2, 0.8)
+        self.size = rng.randint(20, 40)
         
     def update(self):
         self.x -= self.speed
         if self.x < -self.size:
             self.x = SCREEN_WIDTH + self.size
-            self.y = random.randint(50, 200)
+            self.y = self.rng.randint(50, 200)
             
     def draw(self, screen):
         cloud_color = (255, 255, 255, 150)
@@ -359,61 +668,382 @@ class Cloud:
         
         screen.blit(cloud_surface, (int(self.x), int(self.y)))
 
-class Game:
-    def __init__(self):
+def sky_color(time_cycle, time_offset, sky_progress):
+    # Define color sets for different times
+    day_colors = (135, 206, 235)
+    sunset_colors = (255, 154, 77)
+    evening_colors = (72, 61, 139)
+    night_colors = (25, 25, 112)
+
+    # Smooth interpolation between time periods
+    if time_cycle <= 0.25:  # Day to Sunset
+        blend = time_cycle * 4  # 0 to 1
+        start, end = day_colors, sunset_colors
+    elif time_cycle <= 0.5:  # Sunset to Evening
+        blend = (time_cycle - 0.25) * 4
+        start, end = sunset_colors, evening_colors
+    elif time_cycle <= 0.75:  # Evening to Night
+        blend = (time_cycle - 0.5) * 4
+        start, end = evening_colors, night_colors
+    else:  # Night to Day
+        blend = (time_cycle - 0.75) * 4
+        start, end = night_colors, day_colors
+    base_r = int(start[0] * (1 - blend) + end[0] * blend)
+    base_g = int(start[1] * (1 - blend) + end[1] * blend)
+    base_b = int(start[2] * (1 - blend) + end[2] * blend)
+
+    # Add subtle variations for more natural look
+    variation_r = math.sin(time_offset * 2 + sky_progress) * 10
+    variation_g = math.cos(time_offset * 1.5 + sky_progress * 1.5) * 8
+    variation_b = math.sin(time_offset * 1.8 + sky_progress * 2) * 12
+
+    final_r = max(0, min(255, base_r + variation_r))
+    final_g = max(0, min(255, base_g + variation_g))
+    final_b = max(0, min(255, base_b + variation_b))
+    return (int(final_r), int(final_g), int(final_b))
+
+class SkyRenderer:
+    # Pre-renders the sky gradient once per quantized time_cycle and keeps the
+    # most recently used surfaces in a small LRU cache, so a frame is one blit.
+    def __init__(self, levels=SKY_CACHE_LEVELS, cache_size=SKY_CACHE_SIZE):
+        self.levels = levels
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, time_offset):
+        # sin() visits each time_cycle value twice per period, once rising and
+        # once falling, and the color variations differ between the two
+        phase = time_offset % (2 * math.pi)
+        rising = math.cos(phase) >= 0
+        time_cycle = (math.sin(phase) + 1) / 2
+        return (rising, round(time_cycle * (self.levels - 1)))
+
+    def render(self, key):
+        rising, level = key
+        time_cycle = level / (self.levels - 1)
+        # Representative time offset on the matching half of the cycle, in
+        # [0, 2pi) like key_for's phase so the color variations line up
+        base = math.asin(max(-1.0, min(1.0, time_cycle * 2 - 1)))
+        time_offset = (base if rising else math.pi - base) % (2 * math.pi)
+
+        strip = pygame.Surface((1, SCREEN_HEIGHT))
+        for y in range(SCREEN_HEIGHT):
+            strip.set_at((0, y), sky_color(time_cycle, time_offset, y / SCREEN_HEIGHT))
+        sky = pygame.transform.scale(strip, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            sky = sky.convert()
+        return sky
+
+    def get(self, time_offset):
+        key = self.key_for(time_offset)
+        sky = self.cache.get(key)
+        if sky is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return sky
+
+        self.misses += 1
+        sky = self.render(key)
+        self.cache[key] = sky
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return sky
+
+    def draw(self, screen, time_offset):
+        screen.blit(self.get(time_offset), (0, 0))
+
+    def set_levels(self, levels):
+        # Cached skies were keyed at the old resolution
+        if levels != self.levels:
+            self.levels = levels
+            self.cache.clear()
+
+    def draw_uncached(self, screen, time_offset):
+        # Original per-row renderer, kept for benchmarking against the cache
+        time_cycle = (math.sin(time_offset) + 1) / 2
+        for y in range(SCREEN_HEIGHT):
+            color = sky_color(time_cycle, time_offset, y / SCREEN_HEIGHT)
+            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+
+class TextCache:
+    # Fonts keyed by (face, size) and an LRU cache of rendered text, so a
+    # steady-state frame neither loads fonts nor renders text
+    def __init__(self, max_surfaces=TEXT_CACHE_SIZE):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.font_loads = 0
+        self.renders = 0
+
+    def font(self, face, size):
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            self.font_loads += 1
+            try:
+                font = pygame.font.Font(face, size)
+            except (OSError, FileNotFoundError):
+                font = pygame.font.Font(None, size)
+            self.fonts[key] = font
+        return font
+
+    def layered(self, text, font, layers):
+        # One surface holding `text` drawn once per (offset, color) layer,
+        # bottom layer first
+        key = (text, font, layers)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        rendered = [(offset, font.render(text, True, color)) for offset, color in layers]
+        self.renders += len(rendered)
+        width = max(offset[0] + text_surface.get_width() for offset, text_surface in rendered)
+        height = max(offset[1] + text_surface.get_height() for offset, text_surface in rendered)
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        for offset, text_surface in rendered:
+            surface.blit(text_surface, offset)
+
+        self.surfaces[key] = surface
+        while len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def render(self, text, font, color):
+        return self.layered(text, font, (((0, 0), color),))
+
+    def shadowed(self, text, font, color, shadow_color):
+        return self.layered(text, font, (((2, 2), shadow_color), ((0, 0), color)))
+
+class DirtyRectRenderer:
+    # Optional renderer that composes frames from a cached static layer plus
+    # the sprites drawn on top of it, and only pushes changed areas to the
+    # display. During play the layer is the sky, stars and clouds; on the
+    # start and game-over screens everything under the overlay text is baked
+    # in, so only the animated text is redrawn.
+    def __init__(self, game, refresh_frames=LAYER_REFRESH_FRAMES):
+        self.game = game
+        self.refresh_frames = refresh_frames
+        self.layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            self.layer = self.layer.convert()
+        self.layer_state = None
+        self.previous = []
+        self.frames = 0
+        self.full_frames = 0
+
+    def layer_is_stale(self, state, overlay):
+        if state != self.layer_state or self.frames % self.refresh_frames == 0:
+            return True
+        # Particles still flying under the overlay are part of the layer
+        return overlay and len(self.game.particles) > 0
+
+    def render(self):
+        game = self.game
+        screen = game.screen
+        overlay = game.game_over or not game.game_started
+        state = (game.game_started, game.game_over)
+        stale = self.layer_is_stale(state, overlay)
+        self.frames += 1
+
+        if stale:
+            self.layer_state = state
+            game.draw_background(self.layer)
+            if overlay:
+                game.draw_world(self.layer)
+                game.draw_score(self.layer)
+                game.draw_overlay_tint(self.layer)
+        else:
+            # Erase last frame's sprites
+            for rect in self.previous:
+                screen.blit(self.layer, rect, rect)
+
+        if stale:
+            screen.blit(self.layer, (0, 0))
+        rects = []
+        if not overlay:
+            rects += game.draw_world(screen)
+            rects.append(game.draw_score(screen))
+        rects += game.draw_hud()
+
+        if stale:
+            self.full_frames += 1
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = rects
+
+class QualityController:
+    # Steps effects down (higher level) when frames take longer than the
+    # budget and back up when there is headroom. Both directions look at a
+    # moving average and wait for a run of frames past separate thresholds,
+    # so a single slow frame or a borderline load doesn't make quality flap
+    def __init__(self, target_fps=FPS):
+        self.budget_ms = 1000 / target_fps
+        self.average_ms = 0.0
+        self.level = 0
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    def record(self, frame_ms):
+        # Feed one frame's working time; True when the level changed
+        self.average_ms += (frame_ms - self.average_ms) * QUALITY_SMOOTHING
+        if self.average_ms > self.budget_ms * QUALITY_DOWN_RATIO:
+            self.over += 1
+            self.under = 0
+        elif self.average_ms < self.budget_ms * QUALITY_UP_RATIO:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= QUALITY_DOWN_FRAMES and self.level < len(QUALITY_LEVELS) - 1:
+            self.set_level(self.level + 1)
+            return True
+        if self.under >= QUALITY_UP_FRAMES and self.level > 0:
+            self.set_level(self.level - 1)
+            return True
+        return False
+
+    def set_level(self, level):
+        self.level = level
+        self.over = self.under = 0
+        self.changes += 1
+
+class PopulationRenderer:
+    # Draws a population.Population's course and every surviving bird. All
+    # birds share one translucent copy of the level bird sprite and go to
+    # the screen in a single blits() call
+    def __init__(self, population, alpha=POPULATION_ALPHA):
+        init()
+        self.population = population
+        self.screen = pygame.display.get_surface()
+        if self.screen is None:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.clock = pygame.time.Clock()
+        self.text = TextCache()
+        self.font = self.text.font(None, 28)
+        self.sky = SkyRenderer()
+        if Pipe.atlas is None:
+            Pipe.atlas = PipeSpriteAtlas()
+        if Bird.frames is None:
+            Bird.frames = BirdFrameCache()
+        # Surface alpha over a color key blits far faster than per-pixel
+        # alpha when thousands of copies overlap
+        frame = Bird.frames.get(0, 0, False)
+        self.sprite = pygame.Surface(frame.get_size()).convert()
+        self.sprite.fill(MAGENTA)
+        self.sprite.blit(frame, (0, 0))
+        self.sprite.set_colorkey(MAGENTA, pygame.RLEACCEL)
+        self.sprite.set_alpha(alpha, pygame.RLEACCEL)
+        self.offset = (self.sprite.get_width() // 2, self.sprite.get_height() // 2)
+
+    def draw(self, max_fps=FPS):
+        # Render one frame; False once the window was closed
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        population = self.population
+        screen = self.screen
+        self.sky.draw(screen, animation_time() * 0.00005)
+        for pipe in population.pipes:
+            screen.blit(Pipe.atlas.get(pipe.height, pipe.gap_size), (pipe.x - 5, 0))
+
+        sprite = self.sprite
+        x = int(population.bird.x) - self.offset[0]
+        tops = (population.y - self.offset[1]).astype(np.int32).tolist()
+        screen.blits([(sprite, (x, top)) for top in tops], doreturn=False)
+
+        status = f"Alive: {len(population)}/{population.size}  Score: {population.score}"
+        screen.blit(self.text.shadowed(status, self.font, WHITE, BLACK), (10, 10))
+        pygame.display.flip()
+        if max_fps:
+            self.clock.tick(max_fps)
+        return True
+
+class Game(Simulation):
+    bird_class = Bird
+    pipe_class = Pipe
+
+    def __init__(self, seed=None, record=False, star_count=STAR_COUNT, audio=False):
+        init(audio)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("🐦 Enhanced Flappy Bird - Ultimate Edition")
         self.clock = pygame.time.Clock()
         
         # Fonts with better styling
-        try:
-            self.font = pygame.font.Font("freesansbold.ttf", 24)
-            self.large_font = pygame.font.Font("freesansbold.ttf", 36)
-            self.title_font = pygame.font.Font("freesansbold.ttf", 48)
-        except:
-            self.font = pygame.font.Font(None, 24)
-            self.large_font = pygame.font.Font(None, 36)
-            self.title_font = pygame.font.Font(None, 48)
+        self.text = TextCache()
+        self.font = self.text.font("freesansbold.ttf", 24)
+        self.large_font = self.text.font("freesansbold.ttf", 36)
+        self.title_font = self.text.font("freesansbold.ttf", 48)
             
-        self.clouds = [Cloud(random.randint(0, SCREEN_WIDTH), random.randint(50, 200)) for _ in range(8)]
-        self.stars = [Star() for _ in range(50)]
-        self.particles = []
+        # Cosmetic randomness has its own stream so it never shifts pipe heights
+        rng = self.effects_rng = random.Random(None if seed is None else f"effects:{seed}")
+        self.clouds = [Cloud(rng.randint(0, SCREEN_WIDTH), rng.randint(50, 200), rng) for _ in range(8)]
+        self.stars = StarField(star_count, rng)
+        self.sky = SkyRenderer()
+        if Bird.frames is None:
+            Bird.frames = BirdFrameCache()
+        if Bird.trail_sprites is None:
+            Bird.trail_sprites = bake_trail_sprites()
+        if Pipe.atlas is None:
+            Pipe.atlas = PipeSpriteAtlas()
+        self.particles = ParticleSystem(rng=rng)
         self.score_pulse = 0
         self.title_bounce = 0
         self.background_time = 0
         self.combo_count = 0
         self.last_score_time = 0
         
-        self.reset_game()
-        
-    def reset_game(self):
-        self.bird = Bird()
-        self.pipes = []
-        self.score = 0
-        self.game_over = False
-        self.game_started = False
+        # Frame profiling, F3 toggles the overlay and F4 exports the samples
+        self.profiler = NullProfiler()
+        self.show_profiler = False
+        self.profiler_lines = None
+        self.profiler_font = self.text.font(None, 18)
+        self.profile_path = None  # Where run() exports the samples on exit
+        
+        # Translucent layers reused every frame
+        self.score_bg = pygame.Surface((140, 50))
+        self.score_bg.set_alpha(150)
+        self.score_bg.fill(BLACK)
+        self.start_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))  # Animated overlay
+        self.start_overlay.set_alpha(180)
+        self.start_overlay.fill((0, 0, 50))
+        self.game_over_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))  # Dramatic overlay
+        self.game_over_overlay.set_alpha(200)
+        self.game_over_overlay.fill((50, 0, 0))
+        self.text_rects = []
+        self.renderer = None  # Optional DirtyRectRenderer used by present()
+        self.quality = None  # Optional QualityController fed by run_fixed()
+        self.apply_quality(0)
+        self.sim_time = 0  # Simulated milliseconds, advanced by update()
+        
+        super().__init__(seed, record)
+        self.replay_file = None  # Open replay.ReplayWriter, one replay per finished game
+        
+    def reset_game(self, seed=None):
+        super().reset_game(seed)
         self.particles.clear()
-        self.current_speed = INITIAL_PIPE_SPEED
-        self.current_gap = INITIAL_PIPE_GAP
-        
-    def get_current_speed(self):
-        # Gradually increase speed based on score
-        speed = INITIAL_PIPE_SPEED + (self.score * SPEED_INCREASE_RATE)
-        return min(speed, MAX_PIPE_SPEED)
-    
-    def get_current_gap(self):
-        # Gradually decrease gap based on score
-        gap = INITIAL_PIPE_GAP - (self.score * GAP_DECREASE_RATE)
-        return max(gap, MIN_PIPE_GAP)
         
     def spawn_pipe(self):
-        self.current_speed = self.get_current_speed()
-        self.current_gap = self.get_current_gap()
-        self.pipes.append(Pipe(SCREEN_WIDTH, self.current_gap, self.current_speed))
+        pipe = super().spawn_pipe()
+        pipe.prerender()
+        return pipe
+
+    def restore(self, state):
+        # Only simulation state is restored; particles, clouds and the other
+        # effects carry on as they are
+        super().restore(state)
+        for pipe in self.pipes:
+            pipe.prerender()
         
     def add_score_particles(self):
         # Enhanced score particles with different types
-        current_time = pygame.time.get_ticks()
+        rng = self.effects_rng
+        current_time = self.sim_time
         
         # Check for combo scoring (multiple scores in quick succession)
         if current_time - self.last_score_time < 2000:  # Within 2 seconds
@@ -424,11 +1054,11 @@ class Game:
         self.last_score_time = current_time
         
         # More particles for combos
-        particle_count = 20 + (self.combo_count * 5)
+        particle_count = int((20 + (self.combo_count * 5)) * self.particle_share)
         
         for _ in range(particle_count):
-            color = random.choice(PARTICLE_COLORS)
-            particle_type = random.choice(["circle", "star", "sparkle"])
+            color = rng.choice(PARTICLE_COLORS)
+            particle_type = rng.choice(["circle", "star", "sparkle"])
             
             # Special effects for high combos
             if self.combo_count >= 3:
@@ -438,37 +1068,35 @@ class Game:
                 particle_type = "sparkle"
                 color = NEON_PINK
             
-            self.particles.append(
-                Particle(
-                    self.bird.x + random.randint(-25, 25),
-                    self.bird.y + random.randint(-25, 25),
-                    color,
-                    random.uniform(-4, 4),  # More spread for combos
-                    random.uniform(-5, -1),
-                    random.randint(40, 70),  # Longer lifetime for special effects
-                    particle_type
-                )
+            self.particles.spawn(
+                self.bird.x + rng.randint(-25, 25),
+                self.bird.y + rng.randint(-25, 25),
+                color,
+                rng.uniform(-4, 4),  # More spread for combos
+                rng.uniform(-5, -1),
+                rng.randint(40, 70),  # Longer lifetime for special effects
+                particle_type
             )
     
     def add_collision_particles(self):
-        for _ in range(30):
-            color = random.choice([RED, ORANGE, YELLOW, CRIMSON])
-            particle_type = random.choice(["circle", "sparkle"])
+        rng = self.effects_rng
+        for _ in range(int(30 * self.particle_share)):
+            color = rng.choice([RED, ORANGE, YELLOW, CRIMSON])
+            particle_type = rng.choice(["circle", "sparkle"])
             
-            self.particles.append(
-                Particle(
-                    self.bird.x + random.randint(-20, 20),
-                    self.bird.y + random.randint(-20, 20),
-                    color,
-                    random.uniform(-5, 5),
-                    random.uniform(-5, -1),
-                    50,
-                    particle_type
-                )
+            self.particles.spawn(
+                self.bird.x + rng.randint(-20, 20),
+                self.bird.y + rng.randint(-20, 20),
+                color,
+                rng.uniform(-5, 5),
+                rng.uniform(-5, -1),
+                50,
+                particle_type
             )
         
     def update(self):
         # Update background elements
+        self.sim_time += 1000 / FPS
         self.background_time += 0.01
         
         # Update clouds
@@ -476,108 +1104,52 @@ class Game:
             cloud.update()
             
         # Update stars
-        for star in self.stars:
-            star.update()
+        self.stars.update()
             
         # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
         
         # Update animations
         self.title_bounce += 0.1
         if self.score_pulse > 0:
             self.score_pulse -= 1
             
-        if not self.game_over and self.game_started:
-            self.bird.update()
-            
-            # Spawn pipes with dynamic spacing based on current speed
-            pipe_spacing = max(200, int(300 - self.current_speed * 20))
-            if len(self.pipes) == 0 or self.pipes[-1].x < SCREEN_WIDTH - pipe_spacing:
-                self.spawn_pipe()
-                
-            # Update pipes
-            for pipe in self.pipes[:]:
-                pipe.update()
-                if pipe.is_off_screen():
-                    self.pipes.remove(pipe)
-                    
-                # Check for scoring
-                if not pipe.passed and pipe.x + PIPE_WIDTH < self.bird.x:
-                    pipe.passed = True
-                    self.score += 1
-                    self.score_pulse = 20
-                    self.add_score_particles()
-                    
-                # Check collision
-                if pipe.collides_with(self.bird):
-                    self.game_over = True
-                    self.add_collision_particles()
-                    
-            # Check ground/ceiling collision
-            if self.bird.y > SCREEN_HEIGHT - BIRD_SIZE // 2 or self.bird.y < BIRD_SIZE // 2:
-                if not self.game_over:
-                    self.add_collision_particles()
-                self.game_over = True
+        was_over = self.game_over
+        self.update_world()
+        if self.game_over and not was_over and self.replay_file is not None:
+            self.replay_file.write(Replay.from_simulation(self))
+        
+    def on_score(self):
+        self.score_pulse = 20
+        self.add_score_particles()
+        
+    def on_crash(self):
+        self.add_collision_particles()
                 
     def draw_text_with_shadow(self, text, font, color, shadow_color, x, y):
-        shadow = font.render(text, True, shadow_color)
-        main_text = font.render(text, True, color)
-        self.screen.blit(shadow, (x + 2, y + 2))
-        self.screen.blit(main_text, (x, y))
-        return main_text.get_rect(x=x, y=y)
+        surface = self.text.shadowed(text, font, color, shadow_color)
+        self.text_rects.append(self.screen.blit(surface, (x, y)))
+        return pygame.Rect(x, y, surface.get_width() - 2, surface.get_height() - 2)
         
     def draw(self):
+        self.draw_background(self.screen)
+        overlay = self.game_over or not self.game_started
+        self.draw_world(self.screen)
+        self.draw_score(self.screen)
+        if overlay:
+            self.draw_overlay_tint(self.screen)
+        self.draw_hud()
+        
+    def draw_background(self, target):
         # Enhanced animated sky gradient with smooth time-based transitions
-        time_offset = pygame.time.get_ticks() * 0.00005  # Slower transition
+        time_offset = animation_time() * 0.00005  # Slower transition
         
         # Create smooth continuous cycle through different times of day
         time_cycle = (math.sin(time_offset) + 1) / 2  # 0 to 1, smoother cycle
         
-        for y in range(SCREEN_HEIGHT):
-            sky_progress = y / SCREEN_HEIGHT
-            
-            # Define color sets for different times
-            day_colors = (135, 206, 235)
-            sunset_colors = (255, 154, 77)
-            evening_colors = (72, 61, 139)
-            night_colors = (25, 25, 112)
-            
-            # Smooth interpolation between time periods
-            if time_cycle <= 0.25:  # Day to Sunset
-                blend = time_cycle * 4  # 0 to 1
-                base_r = int(day_colors[0] * (1 - blend) + sunset_colors[0] * blend)
-                base_g = int(day_colors[1] * (1 - blend) + sunset_colors[1] * blend)
-                base_b = int(day_colors[2] * (1 - blend) + sunset_colors[2] * blend)
-            elif time_cycle <= 0.5:  # Sunset to Evening
-                blend = (time_cycle - 0.25) * 4  # 0 to 1
-                base_r = int(sunset_colors[0] * (1 - blend) + evening_colors[0] * blend)
-                base_g = int(sunset_colors[1] * (1 - blend) + evening_colors[1] * blend)
-                base_b = int(sunset_colors[2] * (1 - blend) + evening_colors[2] * blend)
-            elif time_cycle <= 0.75:  # Evening to Night
-                blend = (time_cycle - 0.5) * 4  # 0 to 1
-                base_r = int(evening_colors[0] * (1 - blend) + night_colors[0] * blend)
-                base_g = int(evening_colors[1] * (1 - blend) + night_colors[1] * blend)
-                base_b = int(evening_colors[2] * (1 - blend) + night_colors[2] * blend)
-            else:  # Night to Day
-                blend = (time_cycle - 0.75) * 4  # 0 to 1
-                base_r = int(night_colors[0] * (1 - blend) + day_colors[0] * blend)
-                base_g = int(night_colors[1] * (1 - blend) + day_colors[1] * blend)
-                base_b = int(night_colors[2] * (1 - blend) + day_colors[2] * blend)
-            
-            # Add subtle variations for more natural look
-            variation_r = math.sin(time_offset * 2 + sky_progress) * 10
-            variation_g = math.cos(time_offset * 1.5 + sky_progress * 1.5) * 8
-            variation_b = math.sin(time_offset * 1.8 + sky_progress * 2) * 12
-            
-            final_r = max(0, min(255, base_r + variation_r))
-            final_g = max(0, min(255, base_g + variation_g))
-            final_b = max(0, min(255, base_b + variation_b))
-            
-            color = (int(final_r), int(final_g), int(final_b))
-            pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
+        self.sky.draw(target, time_offset)
+        profiler = self.profiler
+        profiler.mark("sky")
         
         # Smooth star visibility transition
         # Stars become more visible during evening and night
@@ -586,47 +1158,64 @@ class Game:
         else:
             star_visibility = max(0.0, (0.4 - time_cycle) * 0.5)  # Fade out during day
             
-        for star in self.stars:
-            if star_visibility > 0.1:
-                # Adjust star brightness based on time of day
-                original_brightness = star.brightness
-                star.brightness *= star_visibility
-                star.draw(self.screen)
-                star.brightness = original_brightness  # Restore original brightness
+        if star_visibility > 0.1:
+            # Adjust star brightness based on time of day
+            self.stars.draw(target, star_visibility, self.star_limit)
+        profiler.mark("stars")
         
         # Draw clouds
         for cloud in self.clouds:
-            cloud.draw(self.screen)
-            
+            cloud.draw(target)
+        profiler.mark("clouds")
+        
+    def draw_world(self, target):
+        # Pipes, bird and particles; returns the areas drawn
+        rects = []
+        profiler = self.profiler
+        
         # Draw pipes with enhanced visuals
+        glow = self.pipe_glow
         for pipe in self.pipes:
-            pipe.draw(self.screen)
+            rects.append(pipe.draw(target, glow))
+        profiler.mark("pipes")
             
         # Draw bird
-        self.bird.draw(self.screen)
+        rects.append(self.bird.draw(target, self.trail_length))
+        profiler.mark("bird")
         
         # Draw particles
-        for particle in self.particles:
-            particle.draw(self.screen)
+        rect = self.particles.draw(target)
+        if rect is not None:
+            rects.append(rect)
+        profiler.mark("particles")
+        return rects
         
+    def draw_score(self, target):
         # Enhanced score display 
         score_scale = 1 + (self.score_pulse / 40)
-        score_font = pygame.font.Font(None, int(36 * score_scale))
+        score_font = self.text.font(None, int(36 * score_scale))
         
         # Score background (smaller since we removed difficulty info)
-        score_bg = pygame.Surface((140, 50))
-        score_bg.set_alpha(150)
-        score_bg.fill(BLACK)
-        self.screen.blit(score_bg, (10, 10))
+        rect = target.blit(self.score_bg, (10, 10))
         
         # Score text with glow effect
         score_text = f"Score: {self.score}"
-        for offset in [(2, 2), (1, 1), (0, 0)]:
-            color = SHADOW if offset != (0, 0) else GOLD if self.score_pulse > 0 else WHITE
-            text_surface = score_font.render(score_text, True, color)
-            self.screen.blit(text_surface, (15 + offset[0], 20 + offset[1]))
-            
+        color = GOLD if self.score_pulse > 0 else WHITE
+        text_surface = self.text.layered(score_text, score_font,
+                                         (((2, 2), SHADOW), ((1, 1), SHADOW), ((0, 0), color)))
         # Removed speed and gap indicators
+        return rect.union(target.blit(text_surface, (15, 20)))
+        
+    def draw_overlay_tint(self, target):
+        if self.game_over:
+            target.blit(self.game_over_overlay, (0, 0))
+        else:
+            target.blit(self.start_overlay, (0, 0))
+            
+    def draw_hud(self):
+        # Screen text and the profiler overlay, always drawn straight to the
+        # screen; returns the areas drawn
+        self.text_rects = []
         
         # Draw start screen
         if not self.game_started and not self.game_over:
@@ -636,13 +1225,47 @@ class Game:
         if self.game_over:
             self.draw_game_over_screen()
             
+        if self.show_profiler:
+            self.text_rects.append(self.draw_profiler_overlay())
+        self.profiler.mark("hud")
+        return self.text_rects
+            
+    def draw_profiler_overlay(self):
+        # Refresh the numbers twice a second, computing percentiles is not free
+        if self.profiler_lines is None or self.profiler.frames % (FPS // 2) == 0:
+            stats = self.profiler.percentiles()
+            self.profiler_lines = ["phase       p50    p95    p99 ms"] + [
+                f"{phase:<9} {p50:6.2f} {p95:6.2f} {p99:6.2f}" for phase, (p50, p95, p99) in stats.items()
+            ]
+            if self.quality is not None:
+                self.profiler_lines.append(f"quality level {self.quality.level}/{len(QUALITY_LEVELS) - 1}")
+        
+        line_height = 14
+        panel = pygame.Surface((260, line_height * len(self.profiler_lines) + 10))
+        panel.set_alpha(180)
+        panel.fill(BLACK)
+        rect = self.screen.blit(panel, (SCREEN_WIDTH - 270, 10))
+        for i, line in enumerate(self.profiler_lines):
+            text = self.text.render(line, self.profiler_font, NEON_GREEN)
+            self.screen.blit(text, (SCREEN_WIDTH - 265, 15 + i * line_height))
+        return rect
+            
+    def apply_quality(self, level):
+        sky_levels, glow, trail_length, particle_share, star_share = QUALITY_LEVELS[level]
+        self.sky.set_levels(sky_levels)
+        self.pipe_glow = glow
+        self.trail_length = trail_length
+        self.particle_share = particle_share
+        self.star_limit = int(len(self.stars) * star_share)
+            
+    def toggle_profiler(self):
+        # The overlay needs a recording profiler; switch one on if necessary
+        if not self.profiler.enabled:
+            self.profiler = FrameProfiler()
+        self.show_profiler = not self.show_profiler
+        self.profiler_lines = None
+            
     def draw_start_screen(self):
-        # Animated overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 50))
-        self.screen.blit(overlay, (0, 0))
-        
         # Bouncing title
         bounce_offset = math.sin(self.title_bounce) * 10
         title_y = SCREEN_HEIGHT // 2 - 120 + bounce_offset
@@ -667,7 +1290,8 @@ class Game:
                                        SCREEN_WIDTH // 2 - 100, int(subtitle_y) + 30 + i * 25)
         
         # Animated instructions
-        pulse = math.sin(pygame.time.get_ticks() * 0.005) * 0.3 + 0.7
+        pulse = math.sin(animation_time() * 0.005) * 0.3 + 0.7
+        pulse = round(pulse * TEXT_PULSE_STEPS) / TEXT_PULSE_STEPS  # Bounded set of cached colors
         instruction_color = (int(255 * pulse), int(255 * pulse), 255)
         
         self.draw_text_with_shadow("Press SPACE or Click to Start!", self.large_font, instruction_color, BLACK,
@@ -678,12 +1302,6 @@ class Game:
                                    SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 120)
         
     def draw_game_over_screen(self):
-        # Dramatic overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill((50, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-        
         # Game Over text with dramatic effect
         game_over_y = SCREEN_HEIGHT // 2 - 100
         self.draw_text_with_shadow("GAME OVER", self.title_font, RED, BLACK,
@@ -727,7 +1345,8 @@ class Game:
                                    SCREEN_WIDTH // 2 - len(message) * 6, SCREEN_HEIGHT // 2 + 40)
         
         # Pulsing restart instructions
-        pulse = math.sin(pygame.time.get_ticks() * 0.008) * 0.4 + 0.6
+        pulse = math.sin(animation_time() * 0.008) * 0.4 + 0.6
+        pulse = round(pulse * TEXT_PULSE_STEPS) / TEXT_PULSE_STEPS
         restart_color = (int(255 * pulse), int(255 * pulse), 255)
         
         self.draw_text_with_shadow("Press R to Restart", self.font, restart_color, BLACK,
@@ -743,36 +1362,118 @@ class Game:
                 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    if not self.game_started:
-                        self.game_started = True
-                    elif not self.game_over:
-                        self.bird.jump()
+                    self.flap()
                 elif event.key == pygame.K_r and self.game_over:
                     self.reset_game()
                 elif event.key == pygame.K_q and self.game_over:
                     return False
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                elif event.key == pygame.K_F4 and self.profiler.enabled:
+                    self.profiler.export(PROFILER_EXPORT_PATH)
                     
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left mouse button
-                    if not self.game_started:
-                        self.game_started = True
-                    elif not self.game_over:
-                        self.bird.jump()
+                    self.flap()
                         
         return True
         
-    def run(self):
-        running = True
-        while running:
-            running = self.handle_input()
-            self.update()
+    def present(self):
+        if self.renderer is not None:
+            self.renderer.render()
+        else:
             self.draw()
             pygame.display.flip()
-            self.clock.tick(FPS)
             
+    def run(self, turbo=False, render_every=1, max_fps=FPS):
+        if turbo:
+            self.run_turbo(render_every)
+        else:
+            self.run_fixed(max_fps)
+            
+        if self.replay_file is not None:
+            self.replay_file.close()
+        if self.profile_path and self.profiler.enabled:
+            self.profiler.export(self.profile_path)
         pygame.quit()
         sys.exit()
+        
+    def run_fixed(self, max_fps=FPS):
+        # Fixed-timestep loop: physics always advances in 1/FPS steps, as many
+        # per rendered frame as the elapsed time calls for
+        step_time = 1 / FPS
+        accumulator = 0.0
+        previous = time.perf_counter()
+        running = True
+        while running:
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+            
+            self.profiler.begin_frame()
+            running = self.handle_input()
+            self.profiler.mark("input")
+            while accumulator >= step_time:
+                self.update()
+                accumulator -= step_time
+            self.profiler.mark("update")
+                
+            self.present()
+            self.profiler.mark("flip")
+            self.profiler.end_frame()
+            if self.quality is not None and self.quality.record((time.perf_counter() - now) * 1000):
+                self.apply_quality(self.quality.level)
+            if max_fps:
+                self.clock.tick(max_fps)
+                
+    def run_turbo(self, render_every=1):
+        # Simulation runs at full CPU speed; only every Kth step is rendered
+        # (never when render_every is 0)
+        running = True
+        steps = 0
+        while running:
+            rendering = render_every and steps % render_every == 0
+            self.profiler.begin_frame()
+            if rendering or steps % TURBO_INPUT_INTERVAL == 0:
+                running = self.handle_input()
+            self.profiler.mark("input")
+            self.update()
+            self.profiler.mark("update")
+            if rendering:
+                self.present()
+                self.profiler.mark("flip")
+            self.profiler.end_frame()
+            steps += 1
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Enhanced Flappy Bird")
+    parser.add_argument("--turbo", action="store_true",
+                        help="run the simulation at full speed instead of real time")
+    parser.add_argument("--render-every", type=int, default=1,
+                        help="in turbo mode, render every Kth step (0 disables rendering)")
+    parser.add_argument("--max-fps", type=int, default=FPS,
+                        help="cap on rendered frames per second (0 for unlocked)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible runs")
+    parser.add_argument("--stars", type=int, default=STAR_COUNT,
+                        help="number of stars in the night sky")
+    parser.add_argument("--audio", action="store_true", help="initialize the sound mixer")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="keep full detail instead of dropping effects when frames run late")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw only changed areas on top of a cached background layer")
+    parser.add_argument("--record", metavar="FILE", help="append a replay of every finished game to FILE")
+    parser.add_argument("--profile", metavar="FILE", nargs="?", const=PROFILER_EXPORT_PATH,
+                        help="record frame timings and export them to FILE (.csv or .json) on exit")
+    args = parser.parse_args()
+
+    game = Game(seed=args.seed, record=args.record is not None, star_count=args.stars, audio=args.audio)
+    if args.record:
+        game.replay_file = ReplayWriter(args.record)
+    if args.dirty_rects:
+        game.renderer = DirtyRectRenderer(game)
+    if not args.fixed_quality:
+        game.quality = QualityController(args.max_fps or FPS)
+    if args.profile:
+        game.profiler = FrameProfiler()
+        game.profile_path = args.profile
+    game.run(turbo=args.turbo, render_every=args.render_every, max_fps=args.max_fps)
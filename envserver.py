@@ -0,0 +1,361 @@
+"""Local environment server for agents running in another process.
+
+EnvServer owns a batch of headless simulation.Simulation games and serves
+them over a Unix domain socket, so agents in any language can drive them.
+One STEP message advances every game, and games that end reset on their
+own, as in the rollout workers.
+
+Framing, all little-endian: each message is a 5-byte header (uint8 opcode,
+uint32 payload length) followed by the payload. Requests:
+
+    INFO  b"i"  no payload
+    RESET b"r"  no payload
+    STEP  b"s"  one uint8 action per game (non-zero flaps)
+    STEP_SHARED b"S"  like STEP, but results are left in shared memory
+    OBSERVE b"o"  no payload; current observations without stepping
+    OBSERVE_SHARED b"O"  like OBSERVE, but results are left in shared memory
+    CLOSE b"q"  end this connection
+    SHUTDOWN b"x"  stop the server
+
+Replies carry opcode b"k", or b"e" with a UTF-8 error message. The INFO
+reply holds uint32 games, uint32 observation size, uint16 observation
+version, then the shared-memory block name as UTF-8 (empty if none). RESET,
+STEP and OBSERVE replies hold the results: float32 observations [games,
+size] in simulation.OBSERVATION_FIELDS order, float32 rewards [games] and
+uint8 done flags [games]; OBSERVE leaves rewards and flags as the last step
+set them. With a shared-memory block, STEP_SHARED and OBSERVE_SHARED write
+the same bytes there and reply with an empty payload.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import socket
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from simulation import OBSERVATION_FIELDS, OBSERVATION_VERSION, Simulation
+
+HEADER = struct.Struct("<BI")
+INFO_REPLY = struct.Struct("<IIH")
+
+INFO = ord("i")
+RESET = ord("r")
+STEP = ord("s")
+STEP_SHARED = ord("S")
+OBSERVE = ord("o")
+OBSERVE_SHARED = ord("O")
+CLOSE = ord("q")
+SHUTDOWN = ord("x")
+OK = ord("k")
+ERROR = ord("e")
+
+SOCKET_PATH = "/tmp/flappy-env.sock"
+DISCARD_CHUNK = 65536  # Unwanted payloads are read and dropped this much at a time
+
+
+def recv_exactly(sock, view):
+    while len(view):
+        received = sock.recv_into(view)
+        if received == 0:
+            raise ConnectionError("peer closed the connection")
+        view = view[received:]
+
+
+def discard(sock, length, scratch):
+    # Read and drop `length` bytes through a fixed buffer, whatever the
+    # peer claims to send
+    while length:
+        chunk = scratch[:min(length, len(scratch))]
+        recv_exactly(sock, chunk)
+        length -= len(chunk)
+
+
+def result_views(buffer, num_envs):
+    # Observation, reward and done arrays laid out back to back in `buffer`
+    size = len(OBSERVATION_FIELDS)
+    observations = np.ndarray((num_envs, size), dtype=np.float32, buffer=buffer)
+    offset = observations.nbytes
+    rewards = np.ndarray(num_envs, dtype=np.float32, buffer=buffer, offset=offset)
+    offset += rewards.nbytes
+    dones = np.ndarray(num_envs, dtype=np.uint8, buffer=buffer, offset=offset)
+    return observations, rewards, dones
+
+
+def result_size(num_envs):
+    return num_envs * (len(OBSERVATION_FIELDS) * 4 + 4 + 1)
+
+
+class EnvServer:
+    def __init__(self, path=SOCKET_PATH, num_envs=1, seed=0, shared=True):
+        self.path = path
+        self.num_envs = num_envs
+        seeds = random.Random(seed)
+        self.sims = [Simulation(seeds.getrandbits(63)) for _ in range(num_envs)]
+
+        # Results live in one buffer so a reply is a single send
+        self.block = None
+        if shared:
+            self.block = shared_memory.SharedMemory(create=True, size=result_size(num_envs))
+            self.results = self.block.buf[:result_size(num_envs)]
+        else:
+            self.results = memoryview(bytearray(result_size(num_envs)))
+        self.observations, self.rewards, self.dones = result_views(self.results, num_envs)
+        self.actions = bytearray(num_envs)
+        self.reset()
+
+    def reset(self):
+        for i, sim in enumerate(self.sims):
+            sim.reset_game()
+            sim.flap()
+            sim.observe(self.observations[i])
+        self.rewards[:] = 0
+        self.dones[:] = 0
+
+    def step(self, actions):
+        observations = self.observations
+        rewards = self.rewards
+        dones = self.dones
+        for i, sim in enumerate(self.sims):
+            score = sim.score
+            done = sim.step(actions[i] != 0)
+            rewards[i] = sim.score - score
+            dones[i] = done
+            if done:
+                sim.reset_game()
+                sim.flap()
+            sim.observe(observations[i])
+
+    def observe(self):
+        for i, sim in enumerate(self.sims):
+            sim.observe(self.observations[i])
+
+    def info(self):
+        name = self.block.name.encode() if self.block is not None else b""
+        return INFO_REPLY.pack(self.num_envs, len(OBSERVATION_FIELDS), OBSERVATION_VERSION) + name
+
+    def serve_forever(self):
+        # One client at a time; returns after a SHUTDOWN request
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen(1)
+        try:
+            while True:
+                conn, _ = listener.accept()
+                with conn:
+                    try:
+                        if not self.handle(conn):
+                            return
+                    except ConnectionError:
+                        pass
+        finally:
+            listener.close()
+            os.unlink(self.path)
+            self.close()
+
+    def handle(self, conn):
+        # Serve one connection; False when the server should stop
+        header = bytearray(HEADER.size)
+        header_view = memoryview(header)
+        actions = memoryview(self.actions)
+        scratch = memoryview(bytearray(DISCARD_CHUNK))
+        while True:
+            recv_exactly(conn, header_view)
+            opcode, length = HEADER.unpack(header)
+            if opcode in (INFO, RESET, OBSERVE, OBSERVE_SHARED, CLOSE, SHUTDOWN) and length:
+                # These carry no payload; drop it to stay in frame
+                discard(conn, length, scratch)
+                self.reply(conn, ERROR, f"opcode {opcode} takes no payload, got {length} bytes".encode())
+                continue
+            if opcode in (STEP, STEP_SHARED):
+                if length != self.num_envs:
+                    discard(conn, length, scratch)
+                    self.reply(conn, ERROR, f"expected {self.num_envs} actions, got {length}".encode())
+                    continue
+                recv_exactly(conn, actions)
+                self.step(self.actions)
+                if opcode == STEP_SHARED and self.block is not None:
+                    self.reply(conn, OK)
+                else:
+                    self.reply(conn, OK, self.results)
+            elif opcode in (OBSERVE, OBSERVE_SHARED):
+                self.observe()
+                if opcode == OBSERVE_SHARED and self.block is not None:
+                    self.reply(conn, OK)
+                else:
+                    self.reply(conn, OK, self.results)
+            elif opcode == RESET:
+                self.reset()
+                self.reply(conn, OK, self.results)
+            elif opcode == INFO:
+                self.reply(conn, OK, self.info())
+            elif opcode == CLOSE:
+                return True
+            elif opcode == SHUTDOWN:
+                return False
+            else:
+                discard(conn, length, scratch)
+                self.reply(conn, ERROR, f"unknown opcode {opcode}".encode())
+
+    def reply(self, conn, status, payload=b""):
+        conn.sendall(HEADER.pack(status, len(payload)))
+        if payload:
+            conn.sendall(payload)
+
+    def close(self):
+        if self.block is not None:
+            self.observations = self.rewards = self.dones = None
+            self.results.release()
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+
+class EnvClient:
+    # Stand-in agent side of the protocol. With shared=True, steps read their
+    # results from the server's shared-memory block instead of the socket
+    def __init__(self, path=SOCKET_PATH, shared=False):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.header = bytearray(HEADER.size)
+
+        info = self.request(INFO)
+        self.num_envs, self.observation_size, self.version = INFO_REPLY.unpack_from(info)
+        if self.observation_size != len(OBSERVATION_FIELDS) or self.version != OBSERVATION_VERSION:
+            raise ValueError("server uses a different observation layout")
+        name = bytes(info[INFO_REPLY.size:]).decode()
+
+        self.buffer = bytearray(result_size(self.num_envs))
+        self.block = None
+        if shared and name:
+            self.block = shared_memory.SharedMemory(name=name)
+            # The server owns the block; keep this process's resource tracker
+            # from unlinking it when the client exits
+            resource_tracker.unregister(self.block._name, "shared_memory")
+            self.results = result_views(self.block.buf, self.num_envs)
+        else:
+            self.results = result_views(self.buffer, self.num_envs)
+
+    def request(self, opcode, payload=b"", into=None):
+        self.sock.sendall(HEADER.pack(opcode, len(payload)) + bytes(payload))
+        recv_exactly(self.sock, memoryview(self.header))
+        status, length = HEADER.unpack(self.header)
+        reply = into if into is not None and status == OK and length == len(into) else bytearray(length)
+        recv_exactly(self.sock, memoryview(reply))
+        if status != OK:
+            raise RuntimeError(bytes(reply).decode())
+        return reply
+
+    def reset(self):
+        # (observations, rewards, dones); arrays are reused by later calls
+        # The reply also lands in shared memory, which the server writes to
+        self.request(RESET, into=self.buffer)
+        return self.results
+
+    def step(self, actions):
+        payload = np.asarray(actions, dtype=np.uint8).tobytes()
+        if self.block is not None:
+            self.request(STEP_SHARED, payload)
+        else:
+            self.request(STEP, payload, into=self.buffer)
+        return self.results
+
+    def observe(self):
+        # Current results without stepping; rewards and dones are the last step's
+        if self.block is not None:
+            self.request(OBSERVE_SHARED)
+        else:
+            self.request(OBSERVE, into=self.buffer)
+        return self.results
+
+    def close(self, shutdown=False):
+        self.sock.sendall(HEADER.pack(SHUTDOWN if shutdown else CLOSE, 0))
+        self.sock.close()
+        if self.block is not None:
+            self.results = None
+            self.block.close()
+
+
+def connect(path=SOCKET_PATH, shared=False, timeout=5.0):
+    # EnvClient, retried until the server listens. A socket file left by a
+    # killed server exists before the new one has bound it, so its presence
+    # proves nothing
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return EnvClient(path, shared)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def serve(path, num_envs, seed, shared):
+    EnvServer(path, num_envs, seed, shared).serve_forever()
+
+
+def bench(args):
+    # Start a server process, drive it with the stand-in client and check
+    # its results against the same games stepped in this process
+    server = mp.Process(target=serve, args=(args.socket, args.envs, args.seed, True), daemon=True)
+    server.start()
+    client = connect(args.socket, shared=args.shared)
+    local = EnvServer(args.socket, args.envs, args.seed, shared=False)  # Never listens
+
+    rng = np.random.default_rng(args.seed)
+    actions = rng.random((args.steps, args.envs)) < 0.07
+    observations, rewards, dones = client.reset()
+    local.reset()
+    mismatches = int(not np.array_equal(observations, local.observations))
+    start = time.perf_counter()
+    for step in range(args.steps):
+        observations, rewards, dones = client.step(actions[step])
+        if args.check:
+            local.step(actions[step].astype(np.uint8))
+            mismatches += not (np.array_equal(observations, local.observations)
+                               and np.array_equal(rewards, local.rewards)
+                               and np.array_equal(dones, local.dones))
+            if step % 100 == 0:
+                # OBSERVE must repeat what the last step returned
+                observed = client.observe()[0]
+                mismatches += not np.array_equal(observed, local.observations)
+    elapsed = time.perf_counter() - start
+    client.close(shutdown=True)
+    server.join()
+
+    mode = "shared memory" if args.shared else "socket"
+    print(f"{args.envs} envs over {mode}: {args.steps * args.envs / elapsed:,.0f} env steps/sec, "
+          f"{args.steps / elapsed:,.0f} round trips/sec")
+    if args.check:
+        print(f"steps differing from in-process games: {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve headless games over a Unix domain socket")
+    parser.add_argument("command", choices=("serve", "bench"))
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-shm", action="store_true", help="serve: don't create a shared-memory block")
+    parser.add_argument("--steps", type=int, default=2000, help="bench: batched steps to run")
+    parser.add_argument("--shared", action="store_true", help="bench: read results from shared memory")
+    parser.add_argument("--check", action="store_true", help="bench: compare with games stepped locally")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.envs, args.seed, not args.no_shm)
+    else:
+        bench(args)
+
+
+if __name__ == "__main__":
+    main()
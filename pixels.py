@@ -0,0 +1,114 @@
+"""Downsampled grayscale pixel observations for vision-based agents.
+
+PixelObserver reads the game's screen through a pygame.surfarray.pixels2d
+view, so the full frame is never copied. It samples a small grid of pixels
+and converts them to grayscale with preallocated NumPy buffers, then stores
+the result in a ring buffer of the last K frames. With low_res=True it draws
+a simplified scene (sky, pipes, bird) straight into a surface of the output
+size, and the full-resolution frame is never rendered at all.
+"""
+import math
+
+import numpy as np
+import pygame
+
+import bird
+from bird import SCREEN_WIDTH, SCREEN_HEIGHT, PIPE_WIDTH, GREEN, YELLOW
+
+PIXEL_WIDTH = 84
+PIXEL_HEIGHT = 84
+FRAME_STACK = 4
+
+# ITU-R BT.601 luma weights scaled to 256
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+class PixelObserver:
+    def __init__(self, game, width=PIXEL_WIDTH, height=PIXEL_HEIGHT, stack=FRAME_STACK, low_res=False):
+        self.game = game
+        self.width = width
+        self.height = height
+        self.stack = stack
+        self.low_res = low_res
+        if low_res:
+            self.target = pygame.Surface((width, height), 0, 32)
+        else:
+            self.target = game.screen
+
+        # Nearest-neighbour sample positions, centred in each output cell
+        source_width, source_height = self.target.get_size()
+        self.columns = ((np.arange(width) + 0.5) * source_width / width).astype(np.intp)
+        self.rows = ((np.arange(height) + 0.5) * source_height / height).astype(np.intp)
+        self.shifts = self.target.get_shifts()[:3]
+
+        # Work buffers, indexed [y, x]
+        self.sampled_rows = np.zeros((height, source_width), dtype=np.uint32)
+        self.sampled = np.zeros((height, width), dtype=np.uint32)
+        self.channel = np.zeros((height, width), dtype=np.uint32)
+        self.gray = np.zeros((height, width), dtype=np.uint32)
+
+        # Frame ring buffer, indexed [frame, y, x]; `count` frames written so far
+        self.frames = np.zeros((stack, height, width), dtype=np.uint8)
+        self.ordered = np.zeros_like(self.frames)
+        self.orders = [(np.arange(stack) + start) % stack for start in range(stack)]
+        self.count = 0
+
+    def reset(self):
+        self.frames[:] = 0
+        self.count = 0
+
+    def capture(self):
+        # Sample the current frame into the ring buffer and return it. Call
+        # after Game.draw, or on its own with low_res=True
+        if self.low_res:
+            self.render_low_res()
+
+        # surfarray views are [x, y]; the transpose is the surface's own
+        # row-major memory, so take() reads it without a contiguous copy
+        view = pygame.surfarray.pixels2d(self.target)
+        np.take(view.T, self.rows, axis=0, out=self.sampled_rows, mode="clip")
+        del view  # Unlocks the surface for the next frame's drawing
+        np.take(self.sampled_rows, self.columns, axis=1, out=self.sampled, mode="clip")
+
+        gray = self.gray
+        channel = self.channel
+        gray[:] = 0
+        for shift, weight in zip(self.shifts, GRAY_WEIGHTS):
+            np.right_shift(self.sampled, shift, out=channel)
+            np.bitwise_and(channel, 0xFF, out=channel)
+            np.multiply(channel, weight, out=channel)
+            np.add(gray, channel, out=gray)
+        np.right_shift(gray, 8, out=gray)
+
+        frame = self.frames[self.count % self.stack]
+        np.copyto(frame, gray, casting="unsafe")
+        self.count += 1
+        return frame
+
+    def stacked(self):
+        # The last `stack` frames, oldest first, copied into a reused buffer.
+        # Frames before the first capture are black
+        order = self.orders[self.count % self.stack]
+        return np.take(self.frames, order, axis=0, out=self.ordered)
+
+    def render_low_res(self):
+        # Flat-colored sky, pipes and bird at the output resolution
+        game = self.game
+        surface = self.target
+        scale_x = self.width / SCREEN_WIDTH
+        scale_y = self.height / SCREEN_HEIGHT
+
+        time_offset = bird.animation_time() * 0.00005
+        time_cycle = (math.sin(time_offset) + 1) / 2
+        surface.fill(bird.sky_color(time_cycle, time_offset, 0.5))
+
+        pipe_width = max(1, round(PIPE_WIDTH * scale_x))
+        for pipe in game.pipes:
+            left = int(pipe.x * scale_x)
+            surface.fill(GREEN, (left, 0, pipe_width, int(pipe.height * scale_y)))
+            bottom = int((pipe.height + pipe.gap_size) * scale_y)
+            surface.fill(GREEN, (left, bottom, pipe_width, self.height - bottom))
+
+        body = game.bird
+        radius = max(1, round(body.size / 2 * min(scale_x, scale_y)))
+        pygame.draw.circle(surface, YELLOW, (int(body.x * scale_x), int(body.y * scale_y)), radius)
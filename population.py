@@ -0,0 +1,148 @@
+"""A population of birds flying one shared pipe course.
+
+Population runs K birds through a single stream of pipes, for evolutionary
+training where every individual should face the same course. The pipes,
+difficulty ramp and scoring come from simulation.Simulation. The birds live
+in NumPy arrays holding only the survivors: each step applies physics and
+collision tests to all of them at once and drops the ones that crashed. All
+birds share one x position, so every survivor has passed the same pipes and
+the course score is their score. A bird's fitness is the ticks it survived
+and the score it had reached when it crashed.
+"""
+import argparse
+
+import numpy as np
+
+from simulation import (
+    SCREEN_HEIGHT, BIRD_SIZE, PIPE_WIDTH, GRAVITY, JUMP_STRENGTH, Simulation,
+)
+from vecenv import OBSERVATION_SIZE, gap_ahead
+
+
+class Population(Simulation):
+    def __init__(self, size, seed=None):
+        self.size = size
+        super().__init__(seed)
+
+    def reset_game(self, seed=None):
+        super().reset_game(seed)
+        # The course's own bird never flies; it marks the shared x position
+        # for scoring and the pipe lookups
+        self.game_started = True
+        self.ids = np.arange(self.size)
+        self.y = np.full(self.size, float(self.bird.y))
+        self.velocity = np.zeros(self.size)
+        self.fitness_ticks = np.zeros(self.size, dtype=np.int64)
+        self.fitness_score = np.zeros(self.size, dtype=np.int64)
+        self.bird_observations = np.zeros((self.size, OBSERVATION_SIZE), dtype=np.float32)
+
+    def __len__(self):
+        # Birds still flying
+        return len(self.ids)
+
+    def step(self, jump=False):
+        # Advance one tick; `jump` is one flag for every bird, as in
+        # Simulation.step, or one per bird of the population, where entries
+        # of crashed birds are ignored. Returns True once all crashed
+        if self.game_over:
+            return True
+        jumping = np.broadcast_to(np.asarray(jump, dtype=bool), (self.size,))[self.ids]
+        self.velocity[jumping] = JUMP_STRENGTH
+
+        self.ticks += 1
+        self.velocity += GRAVITY
+        self.y += self.velocity
+        self.advance_course()
+
+        # Ground/ceiling, then the pipes overlapping the birds' column
+        y = self.y
+        crashed = (y > SCREEN_HEIGHT - BIRD_SIZE // 2) | (y < BIRD_SIZE // 2)
+        template = self.bird
+        bird_left = int(template.x - BIRD_SIZE // 2)
+        pipes = self.pipes_near(template)
+        if pipes:
+            # Same truncation as PipeBody.collides_with
+            top = np.trunc(y - BIRD_SIZE // 2)
+            bottom = top + BIRD_SIZE
+            for pipe in pipes:
+                left = int(pipe.x)
+                if left < bird_left + BIRD_SIZE and bird_left < left + PIPE_WIDTH:
+                    crashed |= (top < pipe.height) & (bottom > 0)
+                    crashed |= (top < SCREEN_HEIGHT) & (bottom > pipe.height + pipe.gap_size)
+
+        if crashed.any():
+            dead = self.ids[crashed]
+            self.fitness_ticks[dead] = self.ticks
+            self.fitness_score[dead] = self.score
+            alive = ~crashed
+            self.ids = self.ids[alive]
+            self.y = self.y[alive]
+            self.velocity = self.velocity[alive]
+            self.game_over = len(self.ids) == 0
+        return self.game_over
+
+    def snapshot(self):
+        # Simulation's snapshot plus copies of the bird arrays
+        return (super().snapshot(), self.ids.copy(), self.y.copy(), self.velocity.copy(),
+                self.fitness_ticks.copy(), self.fitness_score.copy())
+
+    def restore(self, state):
+        course, ids, y, velocity, fitness_ticks, fitness_score = state
+        super().restore(course)
+        self.ids = ids.copy()
+        self.y = y.copy()
+        self.velocity = velocity.copy()
+        self.fitness_ticks = fitness_ticks.copy()
+        self.fitness_score = fitness_score.copy()
+
+    def fitness(self):
+        # (ticks survived, score) per bird; survivors count up to now
+        ticks = self.fitness_ticks.copy()
+        score = self.fitness_score.copy()
+        ticks[self.ids] = self.ticks
+        score[self.ids] = self.score
+        return ticks, score
+
+    def observe_birds(self):
+        # One row per bird in vecenv's column order; rows of crashed birds
+        # keep their last values. observe() still describes the course bird
+        out = self.bird_observations
+        rows = self.ids
+        out[rows, 0] = self.y
+        out[rows, 1] = self.velocity
+        out[rows, 2], out[rows, 3], out[rows, 4] = gap_ahead(self)
+        return out
+
+
+def random_policies(size, rng):
+    # Linear flap rules with random weights over the observation columns
+    weights = rng.normal(size=(size, OBSERVATION_SIZE)) / np.array([300, 10, 500, 300, 300])
+    bias = rng.normal(size=size)
+    return lambda observation: (observation * weights).sum(axis=1) + bias > 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fly a random population through one course")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render", action="store_true", help="draw the survivors while they fly")
+    args = parser.parse_args()
+
+    population = Population(args.size, args.seed)
+    policy = random_policies(args.size, np.random.default_rng(args.seed))
+    renderer = None
+    if args.render:
+        from bird import PopulationRenderer
+        renderer = PopulationRenderer(population)
+    while not population.step(policy(population.observe_birds())):
+        if renderer is not None and not renderer.draw():
+            break
+
+    ticks, score = population.fitness()
+    print(f"birds:      {args.size}")
+    print(f"ticks:      best {ticks.max()}, mean {ticks.mean():.1f}")
+    print(f"score:      best {score.max()}, mean {score.mean():.2f}")
+
+
+if __name__ == "__main__":
+    main()
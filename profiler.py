@@ -0,0 +1,92 @@
+"""Per-phase frame timing for the game loop.
+
+FrameProfiler attributes the time between successive mark() calls to the
+named phase and keeps the last `capacity` frames in a fixed-size ring buffer.
+NullProfiler has the same interface and does nothing, so the instrumentation
+can stay in place when profiling is off.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+
+PHASES = ("input", "update", "sky", "stars", "clouds", "pipes", "bird", "particles", "hud", "flip")
+PROFILER_CAPACITY = 600  # Frames kept, 10 seconds at 60 FPS
+
+
+class NullProfiler:
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, phases=PHASES, capacity=PROFILER_CAPACITY):
+        self.phases = phases
+        self.index = {phase: i for i, phase in enumerate(phases)}
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(phases)))  # milliseconds
+        self.current = np.zeros(len(phases))
+        self.frames = 0
+        self.last = time.perf_counter()
+
+    def begin_frame(self):
+        self.current[:] = 0
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        # Everything since the previous mark belongs to `phase`
+        now = time.perf_counter()
+        self.current[self.index[phase]] += (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self):
+        self.samples[self.frames % self.capacity] = self.current
+        self.frames += 1
+
+    def recorded(self):
+        # Recorded frames, oldest first
+        if self.frames <= self.capacity:
+            return self.samples[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        # {phase: [p50, p95, p99]} in milliseconds, plus the frame total
+        samples = self.recorded()
+        if len(samples) == 0:
+            return {}
+        columns = np.column_stack((samples, samples.sum(axis=1)))
+        values = np.percentile(columns, quantiles, axis=0)
+        names = self.phases + ("total",)
+        return {name: values[:, i].tolist() for i, name in enumerate(names)}
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.phases)
+            writer.writerows(self.recorded().round(4).tolist())
+
+    def export_json(self, path):
+        with open(path, "w") as file:
+            json.dump({
+                "phases": list(self.phases),
+                "frames": self.recorded().round(4).tolist(),
+                "percentiles": self.percentiles(),
+            }, file, indent=2)
+
+    def export(self, path):
+        if path.endswith(".json"):
+            self.export_json(path)
+        else:
+            self.export_csv(path)
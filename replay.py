@@ -0,0 +1,144 @@
+"""Compact binary replays of seeded games.
+
+A replay file is a sequence of records. Each record is a fixed-size header
+(magic, version, game seed, tick count, final score and the physics
+constants the game ran with) followed by the jump inputs packed one bit per
+tick, LSB first. Games re-simulate deterministically from the seed and the
+inputs. ReplayReader maps the file with mmap, so scanning headers of millions
+of runs never loads the input bits into memory.
+"""
+import mmap
+import struct
+import sys
+
+import simulation
+from simulation import Simulation
+
+MAGIC = b"FBRP"
+VERSION = 2
+
+# magic, version, flags, seed, ticks, score, integer constants, float constants
+HEADER = struct.Struct("<4sHHQII10H6d")
+
+
+def current_constants():
+    return (
+        simulation.SCREEN_WIDTH, simulation.SCREEN_HEIGHT, simulation.BIRD_SIZE,
+        simulation.PIPE_WIDTH, simulation.INITIAL_PIPE_GAP, simulation.MIN_PIPE_GAP,
+        simulation.FPS, simulation.PIPE_SPACING_BASE, simulation.PIPE_SPACING_SLOPE,
+        simulation.MIN_PIPE_SPACING,
+        float(simulation.INITIAL_PIPE_SPEED), float(simulation.MAX_PIPE_SPEED),
+        float(simulation.GRAVITY), float(simulation.JUMP_STRENGTH),
+        float(simulation.SPEED_INCREASE_RATE), float(simulation.GAP_DECREASE_RATE),
+    )
+
+
+class Replay:
+    def __init__(self, seed, ticks, score, inputs, constants=None):
+        self.seed = seed
+        self.ticks = ticks
+        self.score = score
+        self.inputs = inputs
+        self.constants = constants if constants is not None else current_constants()
+
+    @classmethod
+    def from_simulation(cls, sim):
+        if sim.inputs is None:
+            raise ValueError("simulation was not created with record=True")
+        return cls(sim.seed, sim.ticks, sim.score, bytes(sim.inputs))
+
+    def jumps(self):
+        inputs = self.inputs
+        for tick in range(self.ticks):
+            yield inputs[tick >> 3] >> (tick & 7) & 1
+
+    def simulate(self, sim=None):
+        # Re-run the game headless; the result must match the recorded run
+        if self.constants != current_constants():
+            raise ValueError("replay was recorded with different game constants")
+        if sim is None:
+            sim = Simulation()
+        sim.reset_game(self.seed)
+        sim.flap()
+        for jump in self.jumps():
+            if sim.step(jump):
+                break
+        if sim.ticks != self.ticks or sim.score != self.score:
+            raise ValueError(f"replay diverged: {sim.ticks} ticks, score {sim.score}, "
+                             f"expected {self.ticks} ticks, score {self.score}")
+        return sim
+
+    def pack(self):
+        header = HEADER.pack(MAGIC, VERSION, 0, self.seed, self.ticks, self.score, *self.constants)
+        return header + bytes(self.inputs[:(self.ticks + 7) // 8])
+
+
+class ReplayWriter:
+    # Appends replays to a file
+    def __init__(self, path):
+        self.file = open(path, "ab")
+
+    def write(self, replay):
+        self.file.write(replay.pack())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayReader:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self.map = b""
+
+    def headers(self):
+        # (offset, seed, ticks, score) of every record, without touching inputs
+        data = self.map
+        offset = 0
+        while offset < len(data):
+            magic, version, _, seed, ticks, score = HEADER.unpack_from(data, offset)[:6]
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"not a version {VERSION} replay record at offset {offset}")
+            yield offset, seed, ticks, score
+            offset += HEADER.size + (ticks + 7) // 8
+
+    def read(self, offset):
+        fields = HEADER.unpack_from(self.map, offset)
+        ticks = fields[4]
+        start = offset + HEADER.size
+        inputs = self.map[start:start + (ticks + 7) // 8]
+        return Replay(fields[3], ticks, fields[5], inputs, fields[6:])
+
+    def __iter__(self):
+        for offset, _, _, _ in self.headers():
+            yield self.read(offset)
+
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Usage: python replay.py FILE  -- verify every replay in FILE
+    with ReplayReader(sys.argv[1]) as reader:
+        count = 0
+        for replay in reader:
+            replay.simulate()
+            count += 1
+    print(f"{count} replays verified")
@@ -0,0 +1,189 @@
+"""Rollout workers that step headless games in a multiprocessing pool.
+
+Each worker owns a slice of the environments and runs them with
+simulation.Simulation. Actions, observations, rewards and done flags live in
+multiprocessing.shared_memory buffers; the parent and workers only exchange
+one-byte commands, so nothing is pickled per step.
+"""
+import multiprocessing as mp
+import random
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from simulation import Simulation
+from vecenv import OBSERVATION_SIZE, observe_simulation
+
+STEP = b"s"
+RESET = b"r"
+CLOSE = b"q"
+DONE = b"d"
+
+
+class SharedBuffers:
+    # Named shared-memory arrays for a batch of environments
+    def __init__(self, num_envs, names=None):
+        self.num_envs = num_envs
+        specs = {
+            "actions": ((num_envs,), np.uint8),
+            "observations": ((num_envs, OBSERVATION_SIZE), np.float32),
+            "rewards": ((num_envs,), np.float32),
+            "dones": ((num_envs,), np.bool_),
+        }
+        self.blocks = {}
+        for key, (shape, dtype) in specs.items():
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            if names is None:
+                block = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self.blocks[key] = block
+            setattr(self, key, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+    def names(self):
+        return {key: block.name for key, block in self.blocks.items()}
+
+    def close(self, unlink=False):
+        for key, block in self.blocks.items():
+            setattr(self, key, None)
+            block.close()
+            if unlink:
+                block.unlink()
+
+
+def worker(conn, names, num_envs, start, stop, seed):
+    buffers = SharedBuffers(num_envs, names)
+    actions = buffers.actions[start:stop]
+    observations = buffers.observations[start:stop]
+    rewards = buffers.rewards[start:stop]
+    dones = buffers.dones[start:stop]
+
+    seeds = random.Random(seed)
+    sims = [Simulation(seeds.getrandbits(63)) for _ in range(stop - start)]
+
+    def reset():
+        for i, sim in enumerate(sims):
+            sim.reset_game()
+            sim.flap()
+            observe_simulation(sim, observations[i])
+        rewards[:] = 0
+        dones[:] = False
+
+    reset()
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == STEP:
+                for i, sim in enumerate(sims):
+                    score = sim.score
+                    done = sim.step(bool(actions[i]))
+                    rewards[i] = sim.score - score
+                    dones[i] = done
+                    if done:
+                        sim.reset_game()
+                        sim.flap()
+                    observe_simulation(sim, observations[i])
+            elif command == RESET:
+                reset()
+            elif command == CLOSE:
+                break
+            conn.send_bytes(DONE)
+    finally:
+        buffers.close()
+        conn.close()
+
+
+class RolloutPool:
+    def __init__(self, num_workers, envs_per_worker=1, seed=0):
+        self.num_workers = num_workers
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = num_workers * envs_per_worker
+        self.buffers = SharedBuffers(self.num_envs)
+        self.slices = [slice(i * envs_per_worker, (i + 1) * envs_per_worker) for i in range(num_workers)]
+
+        self.conns = []
+        self.processes = []
+        self.pending = set()
+        for index, envs in enumerate(self.slices):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=worker, daemon=True,
+                                 args=(child_conn, self.buffers.names(), self.num_envs,
+                                       envs.start, envs.stop, seed + index))
+            process.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+
+    @property
+    def observations(self):
+        return self.buffers.observations
+
+    @property
+    def rewards(self):
+        return self.buffers.rewards
+
+    @property
+    def dones(self):
+        return self.buffers.dones
+
+    def send(self, command, workers):
+        for index in workers:
+            self.conns[index].send_bytes(command)
+            self.pending.add(index)
+
+    def reset(self):
+        self.wait_all()
+        self.send(RESET, range(self.num_workers))
+        self.wait_all()
+        return self.buffers.observations
+
+    def step(self, actions):
+        # Synchronous batched step over every environment
+        self.wait_all()
+        self.buffers.actions[:] = actions
+        self.send(STEP, range(self.num_workers))
+        self.wait_all()
+        return self.buffers.observations, self.buffers.rewards, self.buffers.dones
+
+    def step_async(self, workers, actions):
+        # Start a step on the given workers; `actions` covers their envs only
+        actions = np.asarray(actions).reshape(len(workers), self.envs_per_worker)
+        for index, worker_actions in zip(workers, actions):
+            if index in self.pending:
+                raise RuntimeError(f"worker {index} is still stepping")
+            self.buffers.actions[self.slices[index]] = worker_actions
+        self.send(STEP, workers)
+
+    def wait_ready(self, timeout=None):
+        # Indices of pending workers that have finished; their slices of the
+        # shared buffers are up to date
+        by_conn = {self.conns[index]: index for index in self.pending}
+        ready = sorted(by_conn[conn] for conn in wait(list(by_conn), timeout))
+        for index in ready:
+            self.conns[index].recv_bytes()
+            self.pending.discard(index)
+        return ready
+
+    def wait_all(self):
+        while self.pending:
+            self.wait_ready()
+
+    def close(self):
+        if not self.processes:
+            return
+        self.wait_all()
+        self.send(CLOSE, range(self.num_workers))
+        self.pending.clear()
+        for process in self.processes:
+            process.join()
+        for conn in self.conns:
+            conn.close()
+        self.processes = []
+        self.buffers.close(unlink=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,368 @@
+"""Headless Flappy Bird simulation: bird physics, pipes, scoring and collision.
+
+No pygame dependency, so it can be stepped faster than real time for
+training and evaluation. bird.Game renders on top of Simulation.
+Simulation.observe() writes a compact state vector for agents; its layout is
+described by observation_schema().
+"""
+import random
+from collections import deque
+
+import numpy as np
+
+# Constants
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 600
+BIRD_SIZE = 30
+PIPE_WIDTH = 60
+INITIAL_PIPE_GAP = 250  # Start with larger gap
+MIN_PIPE_GAP = 150      # Minimum gap size
+INITIAL_PIPE_SPEED = 1.5  # Start slower
+MAX_PIPE_SPEED = 4.5      # Maximum speed
+GRAVITY = 0.45
+JUMP_STRENGTH = -8
+PIPE_SPAWN_RATE = 5000  # milliseconds
+FPS = 60
+
+# Speed and gap progression settings
+SPEED_INCREASE_RATE = 0.08  # How much speed increases per score point
+GAP_DECREASE_RATE = 4       # How much gap decreases per score point
+
+# Pipe spacing shrinks as pipes speed up:
+# max(MIN_PIPE_SPACING, int(PIPE_SPACING_BASE - speed * PIPE_SPACING_SLOPE))
+PIPE_SPACING_BASE = 300
+PIPE_SPACING_SLOPE = 20
+MIN_PIPE_SPACING = 200
+
+# Observation vector layout. Bump OBSERVATION_VERSION whenever fields are
+# added, removed or reordered so stored datasets and trained agents can tell
+# layouts apart. Missing pipes read as an open gap at the right screen edge.
+OBSERVATION_VERSION = 1
+OBSERVATION_FIELDS = (
+    "bird_y", "bird_velocity", "bird_angle",
+    "pipe1_distance", "pipe1_gap_top", "pipe1_gap_bottom",
+    "pipe2_distance", "pipe2_gap_top", "pipe2_gap_bottom",
+    "speed", "gap", "score",
+)
+OBSERVATION_DTYPE = np.float32
+
+
+def observation_schema():
+    return {
+        "version": OBSERVATION_VERSION,
+        "dtype": np.dtype(OBSERVATION_DTYPE).name,
+        "fields": list(OBSERVATION_FIELDS),
+    }
+
+
+def observe_batch(sims, out=None):
+    # One observation row per simulation, written into `out` when given
+    if out is None:
+        out = np.zeros((len(sims), len(OBSERVATION_FIELDS)), dtype=OBSERVATION_DTYPE)
+    for sim, row in zip(sims, out):
+        sim.observe(row)
+    return out
+
+
+def reference_agent(sim):
+    # Scripted policy for benchmarks and sweeps: flap when falling below the
+    # middle of the next gap, or of the screen before the first pipe
+    bird = sim.bird
+    pipes = sim.next_pipes(1)
+    if pipes:
+        middle = pipes[0].height + pipes[0].gap_size / 2 + 20
+    else:
+        middle = SCREEN_HEIGHT / 2
+    return bird.velocity > 0 and bird.y > middle
+
+
+class BirdBody:
+    def __init__(self):
+        self.x = 50
+        self.y = SCREEN_HEIGHT // 2
+        self.velocity = 0
+        self.size = BIRD_SIZE
+        self.angle = 0
+        self.animation_frame = 0
+        self.wing_flap = 0
+
+    def jump(self):
+        self.velocity = JUMP_STRENGTH
+        self.wing_flap = 10
+
+    def update(self):
+        self.velocity += GRAVITY
+        self.y += self.velocity
+
+        # Update angle based on velocity for realistic rotation
+        self.angle = min(30, max(-30, self.velocity * 3))
+
+        # Wing flap animation
+        self.animation_frame += 1
+        if self.wing_flap > 0:
+            self.wing_flap -= 1
+
+
+class PipeBody:
+    def __init__(self, x, gap_size, speed, rng=random):
+        self.x = x
+        self.gap_size = gap_size
+        self.speed = speed
+        self.height = rng.randint(100, SCREEN_HEIGHT - gap_size - 100)
+        self.passed = False
+
+    def update(self):
+        self.x -= self.speed
+
+    def collides_with(self, bird):
+        # Same result as colliding the bird's and pipes' pygame.Rects, which
+        # truncate coordinates to ints and treat right/bottom edges as open
+        left = int(self.x)
+        bird_left = int(bird.x - bird.size // 2)
+        if not (left < bird_left + bird.size and bird_left < left + PIPE_WIDTH):
+            return False
+        bird_top = int(bird.y - bird.size // 2)
+        bird_bottom = bird_top + bird.size
+        hits_top = bird_top < self.height and bird_bottom > 0
+        hits_bottom = bird_top < SCREEN_HEIGHT and bird_bottom > self.height + self.gap_size
+        return hits_top or hits_bottom
+
+    def is_off_screen(self):
+        return self.x + PIPE_WIDTH < 0
+
+
+class Simulation:
+    # Subclasses swap in their own bird and pipe types (bird.Game uses the
+    # drawable ones) and react to events through on_score/on_crash
+    bird_class = BirdBody
+    pipe_class = PipeBody
+
+    def __init__(self, seed=None, record=False):
+        # Each game gets its own seed from this stream, so a seeded Simulation
+        # replays the same sequence of games
+        self.seed_rng = random.Random(seed)
+        self.seed_rng_state = None  # Cached seed_rng.getstate(), as rng_state
+        self.record = record
+        self.observation = np.zeros(len(OBSERVATION_FIELDS), dtype=OBSERVATION_DTYPE)
+        self.reset_game()
+
+    def reset_game(self, seed=None):
+        if seed is None:
+            seed = self.seed_rng.getrandbits(63)
+            self.seed_rng_state = None
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rng_state = None  # Cached rng.getstate(), dropped whenever rng is used
+        self.bird = self.bird_class()
+
+        # Pipes in spawn order, which is also x order: they spawn at the right
+        # edge and leave on the left. Pipes before `next_pipe` are passed
+        self.pipes = deque()
+        self.next_pipe = 0
+        self.score = 0
+        self.game_over = False
+        self.game_started = False
+        self.current_speed = INITIAL_PIPE_SPEED
+        self.current_gap = INITIAL_PIPE_GAP
+        self.ticks = 0
+
+        # Jump inputs packed one bit per tick, LSB first, when recording
+        self.jumped = False
+        self.inputs = bytearray() if self.record else None
+
+    def snapshot(self):
+        # Everything that decides how the game continues, as nested tuples
+        # that are immutable, so a snapshot can be kept or shared as is
+        bird = self.bird
+        if self.rng_state is None:
+            # The generator only advances when a pipe spawns, so its state
+            # is shared by all snapshots in between
+            self.rng_state = self.rng.getstate()
+        if self.seed_rng_state is None:
+            # Likewise, the seed stream only advances when a game resets
+            self.seed_rng_state = self.seed_rng.getstate()
+        return (
+            self.seed_rng_state, self.seed, self.rng_state, self.ticks, self.score,
+            self.game_over, self.game_started, self.current_speed, self.current_gap,
+            self.jumped, self.next_pipe,
+            (bird.x, bird.y, bird.velocity, bird.angle, bird.animation_frame, bird.wing_flap),
+            tuple((pipe.x, pipe.height, pipe.gap_size, pipe.speed, pipe.passed) for pipe in self.pipes),
+            None if self.inputs is None else bytes(self.inputs),
+        )
+
+    def restore(self, state):
+        # Return to a snapshot; the game then continues bit for bit as it
+        # did from the moment the snapshot was taken
+        (seed_rng_state, self.seed, rng_state, self.ticks, self.score,
+         self.game_over, self.game_started, self.current_speed, self.current_gap,
+         self.jumped, self.next_pipe, bird_state, pipe_states, inputs) = state
+        if rng_state is not self.rng_state:
+            self.rng.setstate(rng_state)
+            self.rng_state = rng_state
+        if seed_rng_state is not self.seed_rng_state:
+            self.seed_rng.setstate(seed_rng_state)
+            self.seed_rng_state = seed_rng_state
+        bird = self.bird
+        bird.x, bird.y, bird.velocity, bird.angle, bird.animation_frame, bird.wing_flap = bird_state
+
+        # Pipes are rebuilt without __init__, which would draw a height
+        pipe_class = self.pipe_class
+        pipes = self.pipes
+        pipes.clear()
+        for x, height, gap_size, speed, passed in pipe_states:
+            pipe = pipe_class.__new__(pipe_class)
+            pipe.x = x
+            pipe.height = height
+            pipe.gap_size = gap_size
+            pipe.speed = speed
+            pipe.passed = passed
+            pipes.append(pipe)
+        self.inputs = None if inputs is None else bytearray(inputs)
+
+    def get_current_speed(self):
+        # Gradually increase speed based on score
+        speed = INITIAL_PIPE_SPEED + (self.score * SPEED_INCREASE_RATE)
+        return min(speed, MAX_PIPE_SPEED)
+
+    def get_current_gap(self):
+        # Gradually decrease gap based on score
+        gap = INITIAL_PIPE_GAP - (self.score * GAP_DECREASE_RATE)
+        return max(gap, MIN_PIPE_GAP)
+
+    def spawn_pipe(self):
+        self.current_speed = self.get_current_speed()
+        self.current_gap = self.get_current_gap()
+        pipe = self.pipe_class(SCREEN_WIDTH, self.current_gap, self.current_speed, self.rng)
+        self.rng_state = None
+        self.pipes.append(pipe)
+        return pipe
+
+    def flap(self):
+        # The first flap starts the game, later ones make the bird jump
+        if not self.game_started:
+            self.game_started = True
+        elif not self.game_over:
+            self.bird.jump()
+            self.jumped = True
+
+    def step(self, jump=False):
+        if jump:
+            self.flap()
+        self.update_world()
+        return self.game_over
+
+    def update_world(self):
+        if self.game_over or not self.game_started:
+            return
+        if self.inputs is not None:
+            if self.ticks % 8 == 0:
+                self.inputs.append(0)
+            if self.jumped:
+                self.inputs[-1] |= 1 << (self.ticks % 8)
+        self.jumped = False
+        self.ticks += 1
+        bird = self.bird
+        bird.update()
+        self.advance_course()
+
+        # Check collision against the pipes overlapping the bird's column,
+        # the last passed pipe and the next one in practice
+        for pipe in self.pipes_near(bird):
+            if pipe.collides_with(bird):
+                self.game_over = True
+                self.on_crash()
+
+        # Check ground/ceiling collision
+        if bird.y > SCREEN_HEIGHT - BIRD_SIZE // 2 or bird.y < BIRD_SIZE // 2:
+            if not self.game_over:
+                self.on_crash()
+            self.game_over = True
+
+    def advance_course(self):
+        # Spawn, move and retire pipes, and score the ones the bird passed
+        bird = self.bird
+
+        # Spawn pipes with dynamic spacing based on current speed
+        pipe_spacing = max(MIN_PIPE_SPACING, int(PIPE_SPACING_BASE - self.current_speed * PIPE_SPACING_SLOPE))
+        if len(self.pipes) == 0 or self.pipes[-1].x < SCREEN_WIDTH - pipe_spacing:
+            self.spawn_pipe()
+
+        # Update pipes
+        pipes = self.pipes
+        for pipe in pipes:
+            pipe.update()
+        while pipes and pipes[0].is_off_screen():
+            pipes.popleft()
+            self.next_pipe -= 1
+        self.next_pipe = max(self.next_pipe, 0)
+
+        # Check for scoring, only the next un-passed pipe can be passed
+        while self.next_pipe < len(pipes) and pipes[self.next_pipe].x + PIPE_WIDTH < bird.x:
+            pipes[self.next_pipe].passed = True
+            self.next_pipe += 1
+            self.score += 1
+            self.on_score()
+
+    def pipes_near(self, bird):
+        # Pipes whose x range overlaps the bird's, found by walking outwards
+        # from the next un-passed pipe
+        pipes = self.pipes
+        left = bird.x - bird.size // 2 - 1
+        right = bird.x - bird.size // 2 + bird.size + 1
+        start = min(self.next_pipe, len(pipes))
+        while start > 0 and pipes[start - 1].x + PIPE_WIDTH > left:
+            start -= 1
+        stop = start
+        while stop < len(pipes) and pipes[stop].x < right:
+            stop += 1
+        return [pipes[i] for i in range(start, stop)]
+
+    def ahead_index(self):
+        # Index of the first pipe still ahead of the bird's centre
+        pipes = self.pipes
+        start = min(self.next_pipe, len(pipes))
+        bird_x = self.bird.x
+        while start > 0 and pipes[start - 1].x + PIPE_WIDTH > bird_x:
+            start -= 1
+        while start < len(pipes) and pipes[start].x + PIPE_WIDTH <= bird_x:
+            start += 1
+        return start
+
+    def next_pipes(self, count=1):
+        # The next `count` pipes ahead of the bird, nearest first
+        start = self.ahead_index()
+        pipes = self.pipes
+        return [pipes[i] for i in range(start, min(start + count, len(pipes)))]
+
+    def observe(self, out=None):
+        # Fill `out` (self.observation by default) in OBSERVATION_FIELDS
+        # order and return it; nothing is allocated per call
+        if out is None:
+            out = self.observation
+        bird = self.bird
+        out[0] = bird.y
+        out[1] = bird.velocity
+        out[2] = bird.angle
+        pipes = self.pipes
+        index = self.ahead_index()
+        for column in (3, 6):
+            if index < len(pipes):
+                pipe = pipes[index]
+                out[column] = pipe.x - bird.x
+                out[column + 1] = pipe.height
+                out[column + 2] = pipe.height + pipe.gap_size
+                index += 1
+            else:
+                out[column] = SCREEN_WIDTH - bird.x
+                out[column + 1] = 0
+                out[column + 2] = SCREEN_HEIGHT
+        out[9] = self.get_current_speed()
+        out[10] = self.get_current_gap()
+        out[11] = self.score
+        return out
+
+    def on_score(self):
+        pass
+
+    def on_crash(self):
+        pass
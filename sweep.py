@@ -0,0 +1,208 @@
+"""Monte Carlo sweep of the difficulty curve.
+
+Runs many headless games per point of a grid of difficulty constants, with
+a scripted reference agent, across a process pool. Each point is split into
+chunks of games. Every finished chunk is written to its own .npz shard in
+the output directory, holding columns of survival ticks and scores. An
+interrupted sweep resumes by skipping the chunks that already have a shard.
+load_results() gathers the shards into one set of columns per grid point.
+
+Usage: python sweep.py OUT_DIR --grid SPEED_INCREASE_RATE=0.05,0.08,0.11
+                       --grid MIN_PIPE_GAP=120,150 [--games 1000] [--workers N]
+"""
+import argparse
+import glob
+import itertools
+import json
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+import simulation
+from simulation import Simulation, reference_agent
+
+# Constants a grid may vary; they are read by Simulation at call time
+SWEEP_PARAMETERS = (
+    "SPEED_INCREASE_RATE", "GAP_DECREASE_RATE", "INITIAL_PIPE_GAP", "MIN_PIPE_GAP",
+    "INITIAL_PIPE_SPEED", "MAX_PIPE_SPEED", "PIPE_SPACING_BASE", "PIPE_SPACING_SLOPE",
+    "MIN_PIPE_SPACING",
+)
+CHUNK_GAMES = 100      # Games per shard
+MAX_TICKS = 20000      # Games still running after this many ticks are cut off
+TICK_BINS = 50         # Survival histogram bins over 0..MAX_TICKS
+SCORE_BINS = 100       # Score histogram bins, one per point, the last open-ended
+
+
+def parse_grid(specs):
+    # ["NAME=v1,v2", ...] -> ordered {NAME: [values]}, typed like the constant
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in SWEEP_PARAMETERS:
+            raise ValueError(f"{name} is not one of {', '.join(SWEEP_PARAMETERS)}")
+        kind = type(getattr(simulation, name))
+        grid[name] = [parse_value(name, kind, value) for value in values.split(",")]
+    return grid
+
+
+def parse_value(name, kind, value):
+    # Int constants accept "120" or "120.0" but not "120.7"; the gap feeds
+    # rng.randint, so it has to stay an int
+    if kind is not int:
+        return kind(value)
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{name} takes whole numbers, got {value}")
+    return int(number)
+
+
+def check_point(point):
+    # Why the constants of one grid point can't run, or None. Unswept
+    # constants keep their current values
+    value = lambda name: point.get(name, getattr(simulation, name))
+    widest_gap = simulation.SCREEN_HEIGHT - 200  # PipeBody keeps 100px above and below the gap
+    for name in ("INITIAL_PIPE_GAP", "MIN_PIPE_GAP"):
+        if not 0 < value(name) <= widest_gap:
+            return f"{name}={value(name)} is outside 1..{widest_gap}"
+    if value("GAP_DECREASE_RATE") < 0:
+        return f"GAP_DECREASE_RATE={value('GAP_DECREASE_RATE')} would widen the gap past INITIAL_PIPE_GAP"
+    for name in ("INITIAL_PIPE_SPEED", "MAX_PIPE_SPEED", "MIN_PIPE_SPACING"):
+        if value(name) <= 0:
+            return f"{name}={value(name)} must be positive"
+    return None
+
+
+def grid_points(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def shard_path(out_dir, point_index, chunk):
+    return os.path.join(out_dir, f"point{point_index:04d}-chunk{chunk:04d}.npz")
+
+
+def run_chunk(task):
+    # Play one chunk of games at a grid point and write its shard
+    out_dir, point_index, chunk, point, games, seed = task
+    defaults = {name: getattr(simulation, name) for name in point}
+    for name, value in point.items():
+        setattr(simulation, name, value)
+    try:
+        sim = Simulation(f"{seed}:{point_index}:{chunk}")
+        ticks = np.zeros(games, dtype=np.int32)
+        scores = np.zeros(games, dtype=np.int32)
+        for game in range(games):
+            sim.reset_game()
+            sim.flap()
+            while not sim.step(reference_agent(sim)) and sim.ticks < MAX_TICKS:
+                pass
+            ticks[game] = sim.ticks
+            scores[game] = sim.score
+    finally:
+        for name, value in defaults.items():
+            setattr(simulation, name, value)
+
+    path = shard_path(out_dir, point_index, chunk)
+    temporary = path + ".tmp.npz"
+    np.savez(temporary, ticks=ticks, scores=scores)
+    os.replace(temporary, path)  # A shard exists only once it is complete
+    return point_index, chunk
+
+
+def load_results(out_dir):
+    # Columns over grid points: one column per swept parameter, the games
+    # played, survival and score summaries, and their histograms
+    with open(os.path.join(out_dir, "sweep.json")) as file:
+        meta = json.load(file)
+    points = meta["points"]
+    columns = {name: np.array([point[name] for point in points]) for name in meta["grid"]}
+    games = np.zeros(len(points), dtype=np.int64)
+    mean_ticks = np.full(len(points), np.nan)
+    mean_score = np.full(len(points), np.nan)
+    median_score = np.full(len(points), np.nan)
+    tick_histogram = np.zeros((len(points), TICK_BINS), dtype=np.int64)
+    score_histogram = np.zeros((len(points), SCORE_BINS), dtype=np.int64)
+    tick_edges = np.linspace(0, MAX_TICKS, TICK_BINS + 1)
+
+    for index in range(len(points)):
+        shards = sorted(glob.glob(os.path.join(out_dir, f"point{index:04d}-chunk*.npz")))
+        shards = [path for path in shards if not path.endswith(".tmp.npz")]
+        if not shards:
+            continue
+        ticks = np.concatenate([np.load(path)["ticks"] for path in shards])
+        scores = np.concatenate([np.load(path)["scores"] for path in shards])
+        games[index] = len(ticks)
+        mean_ticks[index] = ticks.mean()
+        mean_score[index] = scores.mean()
+        median_score[index] = np.median(scores)
+        tick_histogram[index] = np.histogram(ticks, tick_edges)[0]
+        score_histogram[index] = np.bincount(np.minimum(scores, SCORE_BINS - 1), minlength=SCORE_BINS)
+
+    columns.update(games=games, mean_ticks=mean_ticks, mean_score=mean_score, median_score=median_score,
+                   tick_histogram=tick_histogram, score_histogram=score_histogram)
+    return columns
+
+
+def grid_argument(parser, specs):
+    try:
+        grid = parse_grid(specs)
+    except ValueError as error:
+        parser.error(str(error))
+    for point in grid_points(grid):
+        problem = check_point(point)
+        if problem is not None:
+            parser.error(f"grid point {point}: {problem}")
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep of the difficulty constants")
+    parser.add_argument("out_dir")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help=f"values for one of: {', '.join(SWEEP_PARAMETERS)}")
+    parser.add_argument("--games", type=int, default=1000, help="games per grid point")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = grid_argument(parser, args.grid)
+    os.makedirs(args.out_dir, exist_ok=True)
+    meta_path = os.path.join(args.out_dir, "sweep.json")
+    if os.path.exists(meta_path):
+        # Resuming: the stored grid wins so shard indices keep their meaning
+        with open(meta_path) as file:
+            meta = json.load(file)
+        if args.grid and grid != meta["grid"]:
+            parser.error(f"{args.out_dir} holds a sweep over a different grid")
+    else:
+        meta = {"grid": grid, "points": grid_points(grid), "games": args.games, "seed": args.seed}
+        with open(meta_path, "w") as file:
+            json.dump(meta, file, indent=2)
+
+    games = meta["games"]
+    chunks = (games + CHUNK_GAMES - 1) // CHUNK_GAMES
+    tasks = [(args.out_dir, index, chunk, point, min(CHUNK_GAMES, games - chunk * CHUNK_GAMES), meta["seed"])
+             for index, point in enumerate(meta["points"])
+             for chunk in range(chunks)
+             if not os.path.exists(shard_path(args.out_dir, index, chunk))]
+    total = len(meta["points"]) * chunks
+    print(f"{len(meta['points'])} grid points, {games} games each: "
+          f"{total - len(tasks)} of {total} chunks already done")
+
+    with mp.Pool(args.workers) as pool:
+        for done, _ in enumerate(pool.imap_unordered(run_chunk, tasks), 1):
+            if done % 10 == 0 or done == len(tasks):
+                print(f"  {total - len(tasks) + done}/{total} chunks")
+
+    results = load_results(args.out_dir)
+    names = list(meta["grid"])
+    print("  ".join(f"{name:>20}" for name in names) + f"  {'games':>6} {'ticks':>8} {'score':>7} {'median':>7}")
+    for index in range(len(meta["points"])):
+        values = "  ".join(f"{results[name][index]:>20}" for name in names)
+        print(f"{values}  {results['games'][index]:>6} {results['mean_ticks'][index]:8.1f} "
+              f"{results['mean_score'][index]:7.2f} {results['median_score'][index]:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
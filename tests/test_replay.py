@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+import simulation
+from replay import Replay, ReplayReader, ReplayWriter
+from simulation import Simulation, reference_agent
+
+
+def test_replays_round_trip(tmp_path):
+    path = tmp_path / "games.bin"
+    rng = random.Random(0)
+    sim = Simulation(11, record=True)
+    recorded = []
+    with ReplayWriter(path) as writer:
+        for _ in range(20):
+            sim.reset_game()
+            sim.flap()
+            while not sim.step(reference_agent(sim) or rng.random() < 0.003):
+                pass
+            writer.write(Replay.from_simulation(sim))
+            recorded.append((sim.seed, sim.ticks, sim.score))
+
+    with ReplayReader(path) as reader:
+        assert [header[1:] for header in reader.headers()] == recorded
+        for replay in reader:
+            replayed = replay.simulate()
+            assert (replayed.seed, replayed.ticks, replayed.score) == (replay.seed, replay.ticks, replay.score)
+
+
+def test_replay_rejects_other_constants(monkeypatch):
+    sim = Simulation(3, record=True)
+    sim.flap()
+    while not sim.step(reference_agent(sim)):
+        pass
+    replay = Replay.from_simulation(sim)
+    monkeypatch.setattr(simulation, "MIN_PIPE_SPACING", simulation.MIN_PIPE_SPACING - 20)
+    with pytest.raises(ValueError, match="different game constants"):
+        replay.simulate()
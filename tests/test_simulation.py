@@ -0,0 +1,67 @@
+# Contracts of the headless core that VecEnv, replays and planners rely on
+import random
+
+from simulation import PIPE_WIDTH, SCREEN_HEIGHT, BirdBody, PipeBody, Simulation, reference_agent
+
+
+def rect(x, y, width, height):
+    # pygame.Rect keeps coordinates as truncated ints
+    return int(x), int(y), int(width), int(height)
+
+
+def colliderect(a, b):
+    # pygame.Rect.colliderect: empty rects never collide, right/bottom edges are open
+    if not (a[2] and a[3] and b[2] and b[3]):
+        return False
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def rect_collision(pipe, bird):
+    # The pygame.Rect test Game used before the analytic one
+    bird_rect = rect(bird.x - bird.size // 2, bird.y - bird.size // 2, bird.size, bird.size)
+    top = rect(pipe.x, 0, PIPE_WIDTH, pipe.height)
+    bottom_y = pipe.height + pipe.gap_size
+    bottom = rect(pipe.x, bottom_y, PIPE_WIDTH, SCREEN_HEIGHT - bottom_y)
+    return colliderect(bird_rect, top) or colliderect(bird_rect, bottom)
+
+
+def play(sim, jumps):
+    # Step through `jumps`, resetting after every game over; (seed, ticks,
+    # score) of each finished game
+    games = []
+    for jump in jumps:
+        if sim.step(jump):
+            games.append((sim.seed, sim.ticks, sim.score))
+            sim.reset_game()
+            sim.flap()
+    return games
+
+
+def test_collision_matches_rects():
+    rng = random.Random(1)
+    bird = BirdBody()
+    for _ in range(50000):
+        pipe = PipeBody(0, rng.choice([150, 200, 250]), 2, rng)
+        pipe.x = rng.uniform(-80, 120)
+        bird.y = rng.uniform(-20, 640)
+        assert pipe.collides_with(bird) == rect_collision(pipe, bird)
+
+
+def test_restore_continues_bit_for_bit():
+    sim = Simulation(seed=5, record=True)
+    sim.flap()
+    for _ in range(1500):
+        sim.step(reference_agent(sim))
+    snapshot = sim.snapshot()
+
+    # Random flaps end games early, so the continuation crosses resets
+    rng = random.Random(2)
+    jumps = [rng.random() < 0.05 for _ in range(5000)]
+    games = play(sim, jumps)
+    end = sim.snapshot()
+    assert len(games) > 1
+
+    sim.restore(snapshot)
+    assert sim.snapshot() == snapshot
+    assert play(sim, jumps) == games
+    assert sim.snapshot() == end
@@ -0,0 +1,56 @@
+import numpy as np
+
+import simulation
+from vecenv import VecEnv, reference_actions
+
+NUM_ENVS = 16
+STEPS = 4000
+
+
+def test_vecenv_matches_simulation():
+    # Step a VecEnv, then replay each of its games in a Simulation that is
+    # handed the same pipe heights; every tick must agree
+    env = VecEnv(NUM_ENVS, seed=1)
+    heights = [[] for _ in range(NUM_ENVS)]
+    spawn_pipes = env.spawn_pipes
+
+    def recording_spawn():
+        counts = env.pipe_count.copy()
+        spawn_pipes()
+        for e in np.flatnonzero(env.pipe_count > counts):
+            slot = (env.pipe_head[e] + env.pipe_count[e] - 1) % env.max_pipes
+            heights[e].append(int(env.pipe_height[e, slot]))
+
+    env.spawn_pipes = recording_spawn
+    rng = np.random.default_rng(3)
+    obs = env.reset()
+    steps = []
+    for _ in range(STEPS):
+        actions = reference_actions(obs) | (rng.random(NUM_ENVS) < 0.01)
+        obs, rewards, dones = env.step(actions)
+        steps.append((actions, env.bird_y.copy(), env.score.copy(), dones.copy(),
+                      env.final_score.copy(), env.final_ticks.copy()))
+    assert sum(int(step[3].sum()) for step in steps) > NUM_ENVS
+
+    for e in range(NUM_ENVS):
+        spawned = iter(heights[e])
+
+        class ReplayedPipe(simulation.PipeBody):
+            def __init__(self, x, gap_size, speed, rng=None):
+                super().__init__(x, gap_size, speed, rng)
+                self.height = next(spawned)
+
+        class ReplayedSimulation(simulation.Simulation):
+            pipe_class = ReplayedPipe
+
+        sim = ReplayedSimulation()
+        sim.flap()
+        for tick, (actions, bird_y, score, dones, final_score, final_ticks) in enumerate(steps):
+            done = sim.step(bool(actions[e]))
+            assert done == dones[e], (e, tick)
+            if done:
+                assert (sim.score, sim.ticks) == (final_score[e], final_ticks[e]), (e, tick)
+                sim.reset_game()
+                sim.flap()
+            else:
+                assert sim.bird.y == bird_y[e] and sim.score == score[e], (e, tick)
@@ -0,0 +1,191 @@
+"""Batched Flappy Bird environments stepped together over NumPy arrays.
+
+VecEnv keeps the state of N independent games in arrays and advances all of
+them with one vectorized step. Physics and the difficulty ramp follow
+simulation.Simulation exactly; finished games reset automatically.
+"""
+import numpy as np
+
+from simulation import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BIRD_SIZE, PIPE_WIDTH, INITIAL_PIPE_GAP, MIN_PIPE_GAP,
+    INITIAL_PIPE_SPEED, MAX_PIPE_SPEED, GRAVITY, JUMP_STRENGTH,
+    SPEED_INCREASE_RATE, GAP_DECREASE_RATE, PIPE_SPACING_BASE, PIPE_SPACING_SLOPE, MIN_PIPE_SPACING,
+    BirdBody,
+)
+
+# Pipes are at least 200px apart, so no more than 7 fit between spawn and despawn
+MAX_PIPES = 8
+BIRD_X = BirdBody().x
+
+# Observation columns: bird y, bird velocity, distance to the next pipe,
+# top and bottom of its gap
+OBSERVATION_SIZE = 5
+
+
+def gap_ahead(sim):
+    # Columns 2-4 for a simulation.Simulation: distance to the next pipe and
+    # the top and bottom of its gap, or the open screen when none is ahead
+    bird = sim.bird
+    pipes = sim.next_pipes(1)
+    if pipes:
+        pipe = pipes[0]
+        return pipe.x - bird.x, pipe.height, pipe.height + pipe.gap_size
+    return SCREEN_WIDTH - bird.x, 0, SCREEN_HEIGHT
+
+
+def observe_simulation(sim, out):
+    # One observation row, same columns as VecEnv.observe
+    bird = sim.bird
+    out[0] = bird.y
+    out[1] = bird.velocity
+    out[2], out[3], out[4] = gap_ahead(sim)
+
+
+def reference_actions(obs):
+    # simulation.reference_agent over a batch of observation rows. Rows with
+    # no pipe ahead show a gap of 0..SCREEN_HEIGHT, which no pipe can have
+    no_pipe = (obs[:, 3] == 0) & (obs[:, 4] == SCREEN_HEIGHT)
+    middle = np.where(no_pipe, SCREEN_HEIGHT / 2, (obs[:, 3] + obs[:, 4]) / 2 + 20)
+    return (obs[:, 1] > 0) & (obs[:, 0] > middle)
+
+
+class VecEnv:
+    def __init__(self, num_envs, seed=None, max_pipes=MAX_PIPES):
+        self.num_envs = num_envs
+        self.max_pipes = max_pipes
+        self.rng = np.random.default_rng(seed)
+
+        self.bird_y = np.zeros(num_envs)
+        self.bird_velocity = np.zeros(num_envs)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.current_speed = np.zeros(num_envs)
+        self.done = np.zeros(num_envs, dtype=bool)
+
+        # Per-env pipe ring buffers, oldest pipe at `pipe_head`
+        self.pipe_x = np.zeros((num_envs, max_pipes))
+        self.pipe_height = np.zeros((num_envs, max_pipes), dtype=np.int64)
+        self.pipe_gap = np.zeros((num_envs, max_pipes), dtype=np.int64)
+        self.pipe_speed = np.zeros((num_envs, max_pipes))
+        self.pipe_passed = np.zeros((num_envs, max_pipes), dtype=bool)
+        self.pipe_active = np.zeros((num_envs, max_pipes), dtype=bool)
+        self.pipe_head = np.zeros(num_envs, dtype=np.int64)
+        self.pipe_count = np.zeros(num_envs, dtype=np.int64)
+
+        # Score and length of episodes that ended in the last step
+        self.final_score = np.zeros(num_envs, dtype=np.int64)
+        self.final_ticks = np.zeros(num_envs, dtype=np.int64)
+
+        self.rows = np.arange(num_envs)
+        self.observation = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self.reset()
+
+    def reset(self, mask=None):
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        self.bird_y[mask] = SCREEN_HEIGHT // 2
+        self.bird_velocity[mask] = 0
+        self.score[mask] = 0
+        self.ticks[mask] = 0
+        self.current_speed[mask] = INITIAL_PIPE_SPEED
+        self.pipe_active[mask] = False
+        self.pipe_head[mask] = 0
+        self.pipe_count[mask] = 0
+        return self.observe()
+
+    def get_current_speed(self):
+        return np.minimum(INITIAL_PIPE_SPEED + self.score * SPEED_INCREASE_RATE, MAX_PIPE_SPEED)
+
+    def get_current_gap(self):
+        return np.maximum(INITIAL_PIPE_GAP - self.score * GAP_DECREASE_RATE, MIN_PIPE_GAP)
+
+    def spawn_pipes(self):
+        rows = self.rows
+        # Spawn pipes with dynamic spacing based on current speed
+        pipe_spacing = np.maximum(MIN_PIPE_SPACING,
+                                  (PIPE_SPACING_BASE - self.current_speed * PIPE_SPACING_SLOPE).astype(np.int64))
+        last = (self.pipe_head + self.pipe_count - 1) % self.max_pipes
+        need = (self.pipe_count == 0) | (self.pipe_x[rows, last] < SCREEN_WIDTH - pipe_spacing)
+        if not need.any():
+            return
+
+        envs = np.flatnonzero(need)
+        speed = self.get_current_speed()[envs]
+        gap = self.get_current_gap()[envs]
+        self.current_speed[envs] = speed
+        slot = (self.pipe_head[envs] + self.pipe_count[envs]) % self.max_pipes
+        self.pipe_x[envs, slot] = SCREEN_WIDTH
+        self.pipe_height[envs, slot] = self.rng.integers(100, SCREEN_HEIGHT - gap - 100 + 1)
+        self.pipe_gap[envs, slot] = gap
+        self.pipe_speed[envs, slot] = speed
+        self.pipe_passed[envs, slot] = False
+        self.pipe_active[envs, slot] = True
+        self.pipe_count[envs] += 1
+
+    def step(self, actions):
+        # A jump replaces the velocity before gravity is applied, like Bird.jump
+        jump = np.asarray(actions, dtype=bool)
+        self.bird_velocity[jump] = JUMP_STRENGTH
+        self.bird_velocity += GRAVITY
+        self.bird_y += self.bird_velocity
+        self.ticks += 1
+
+        self.spawn_pipes()
+        active = self.pipe_active
+        self.pipe_x -= self.pipe_speed * active
+
+        # Scoring
+        scored = active & ~self.pipe_passed & (self.pipe_x + PIPE_WIDTH < BIRD_X)
+        self.pipe_passed |= scored
+        rewards = scored.sum(axis=1)
+        self.score += rewards
+
+        # Collision, matching PipeBody.collides_with
+        left = np.trunc(self.pipe_x)
+        bird_left = int(BIRD_X - BIRD_SIZE // 2)
+        bird_top = np.trunc(self.bird_y - BIRD_SIZE // 2)[:, None]
+        bird_bottom = bird_top + BIRD_SIZE
+        overlap_x = (left < bird_left + BIRD_SIZE) & (bird_left < left + PIPE_WIDTH)
+        hits_top = (bird_top < self.pipe_height) & (bird_bottom > 0)
+        hits_bottom = (bird_top < SCREEN_HEIGHT) & (bird_bottom > self.pipe_height + self.pipe_gap)
+        crashed = (active & overlap_x & (hits_top | hits_bottom)).any(axis=1)
+
+        # Check ground/ceiling collision
+        crashed |= (self.bird_y > SCREEN_HEIGHT - BIRD_SIZE // 2) | (self.bird_y < BIRD_SIZE // 2)
+
+        # Drop the oldest pipe once it leaves the screen
+        rows = self.rows
+        head = self.pipe_head
+        off = active[rows, head] & (self.pipe_x[rows, head] + PIPE_WIDTH < 0)
+        if off.any():
+            envs = np.flatnonzero(off)
+            self.pipe_active[envs, head[envs]] = False
+            self.pipe_head[envs] = (head[envs] + 1) % self.max_pipes
+            self.pipe_count[envs] -= 1
+
+        self.done = crashed
+        if crashed.any():
+            self.final_score[crashed] = self.score[crashed]
+            self.final_ticks[crashed] = self.ticks[crashed]
+            self.reset(crashed)
+        else:
+            self.observe()
+        return self.observation, rewards.astype(np.float32), crashed
+
+    def observe(self):
+        # Next pipe is the first un-passed one that the bird has not cleared
+        ahead = self.pipe_active & (self.pipe_x + PIPE_WIDTH > BIRD_X)
+        distance = np.where(ahead, self.pipe_x - BIRD_X, np.inf)
+        nearest = distance.argmin(axis=1)
+        has_pipe = ahead.any(axis=1)
+        rows = self.rows
+        height = self.pipe_height[rows, nearest]
+        gap = self.pipe_gap[rows, nearest]
+
+        obs = self.observation
+        obs[:, 0] = self.bird_y
+        obs[:, 1] = self.bird_velocity
+        obs[:, 2] = np.where(has_pipe, distance[rows, nearest], SCREEN_WIDTH - BIRD_X)
+        obs[:, 3] = np.where(has_pipe, height, 0)
+        obs[:, 4] = np.where(has_pipe, height + gap, SCREEN_HEIGHT)
+        return obs